@@ -8,10 +8,39 @@ from utils import (
     perform_normality_test,
     perform_ttest,
     perform_anova,
-    calculate_effect_size
+    calculate_effect_size,
+    bootstrap_ci,
+    permutation_test
 )
 import plotly.figure_factory as ff
 import plotly.express as px
+import os
+from collections import OrderedDict
+from components.figure_cache import get_figure, get_dataset_hash
+
+# Resampling results kept per session
+RESAMPLING_CACHE_SIZE = 16
+# Resampled values (resamples x sample size) a run may draw without confirmation
+RESAMPLE_BUDGET_ELEMENTS = 1_000_000_000
+# Rough cost of drawing one resampled value, for the time estimate
+RESAMPLE_NANOS_PER_ELEMENT = 25
+
+def get_resampling_result(df, spec, resampling, compute):
+    """
+    Return compute() for (dataset hash, spec, n_resamples, seed), running it only on a cache miss.
+
+    spec must capture the test, statistic and columns; results do not depend on n_jobs.
+    """
+    key = (get_dataset_hash(df), spec, resampling['n_resamples'], resampling['seed'])
+    cache = st.session_state.setdefault('resampling_cache', OrderedDict())
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    result = compute()
+    cache[key] = result
+    while len(cache) > RESAMPLING_CACHE_SIZE:
+        cache.popitem(last=False)
+    return result
 
 def show_advanced_analysis_section(df):
     st.header("Advanced Statistical Analysis")
@@ -43,36 +72,16 @@ def show_distribution_analysis(df):
 
     col1, col2 = st.columns(2)
 
+    data = df[selected_col].dropna()
+
     with col1:
         # Histogram with KDE
-        data = df[selected_col].dropna()
-        fig = ff.create_distplot(
-            [data],
-            [selected_col],
-            show_hist=True,
-            show_rug=False
-        )
-        fig.update_layout(title="Distribution Plot with KDE")
+        fig = get_figure(df, ("distplot", selected_col), lambda: build_distplot(data, selected_col))
         st.plotly_chart(fig, use_container_width=True)
 
     with col2:
         # Q-Q plot
-        data = df[selected_col].dropna()
-        theoretical_quantiles = stats.norm.ppf(np.linspace(0.01, 0.99, len(data)))
-        fig = px.scatter(
-            x=np.sort(data),
-            y=theoretical_quantiles,
-            labels={'x': 'Sample Quantiles', 'y': 'Theoretical Quantiles'},
-            title='Q-Q Plot'
-        )
-        fig.add_shape(
-            type='line',
-            x0=data.min(),
-            y0=theoretical_quantiles[0],
-            x1=data.max(),
-            y1=theoretical_quantiles[-1],
-            line=dict(color='red', dash='dash')
-        )
+        fig = get_figure(df, ("qq_plot", selected_col), lambda: build_qq_plot(data))
         st.plotly_chart(fig, use_container_width=True)
 
     # Normality test results
@@ -86,6 +95,36 @@ def show_distribution_analysis(df):
         st.write(f"P-value: {normality_results['p_value']:.4f}")
         st.write(f"Conclusion: {'Normal distribution' if normality_results['is_normal'] else 'Not normally distributed'}")
 
+def build_distplot(data, name):
+    """Histogram with KDE overlay"""
+    fig = ff.create_distplot(
+        [data],
+        [name],
+        show_hist=True,
+        show_rug=False
+    )
+    fig.update_layout(title="Distribution Plot with KDE")
+    return fig
+
+def build_qq_plot(data):
+    """Normal Q-Q plot with reference line"""
+    theoretical_quantiles = stats.norm.ppf(np.linspace(0.01, 0.99, len(data)))
+    fig = px.scatter(
+        x=np.sort(data),
+        y=theoretical_quantiles,
+        labels={'x': 'Sample Quantiles', 'y': 'Theoretical Quantiles'},
+        title='Q-Q Plot'
+    )
+    fig.add_shape(
+        type='line',
+        x0=data.min(),
+        y0=theoretical_quantiles[0],
+        x1=data.max(),
+        y1=theoretical_quantiles[-1],
+        line=dict(color='red', dash='dash')
+    )
+    return fig
+
 def show_hypothesis_testing(df):
     st.subheader("Hypothesis Testing")
 
@@ -103,17 +142,53 @@ def show_hypothesis_testing(df):
             results = perform_ttest(df[selected_col].dropna())
             display_test_results(results)
 
+            resampling = show_resampling_options("ttest", len(df) * (1 if test_type == "One-sample t-test" else 2))
+            if resampling:
+                data = df[selected_col].dropna()
+                display_test_results(get_resampling_result(
+                    df, ('permutation', selected_col), resampling,
+                    lambda: permutation_test(data, **resampling)
+                ))
+                display_bootstrap_results(get_resampling_result(
+                    df, ('bootstrap', 'mean', selected_col), resampling,
+                    lambda: bootstrap_ci(data, statistic='mean', **resampling)
+                ))
+
     elif test_type in ["Two-sample t-test", "Paired t-test"]:
         col1 = st.selectbox("Select first column", numeric_cols, key="col1")
         col2 = st.selectbox("Select second column", numeric_cols, key="col2")
         if col1 and col2:
+            paired = test_type == "Paired t-test"
             results = perform_ttest(
                 df[col1].dropna(),
                 df[col2].dropna(),
-                paired=(test_type == "Paired t-test")
+                paired=paired
             )
             display_test_results(results)
 
+            resampling = show_resampling_options("ttest", len(df) * (1 if test_type == "One-sample t-test" else 2))
+            if resampling:
+                if paired:
+                    # Pairs must come from the same rows
+                    complete = df[col1].notna() & df[col2].notna()
+                    data1, data2 = df.loc[complete, col1], df.loc[complete, col2]
+                else:
+                    data1, data2 = df[col1].dropna(), df[col2].dropna()
+                display_test_results(get_resampling_result(
+                    df, ('permutation', col1, col2, paired), resampling,
+                    lambda: permutation_test(data1, data2, paired=paired, **resampling)
+                ))
+                if paired:
+                    display_bootstrap_results(get_resampling_result(
+                        df, ('bootstrap', 'paired_mean', col1, col2), resampling,
+                        lambda: bootstrap_ci(data1 - data2, statistic='mean', **resampling)
+                    ))
+                else:
+                    display_bootstrap_results(get_resampling_result(
+                        df, ('bootstrap', 'mean_difference', col1, col2), resampling,
+                        lambda: bootstrap_ci(data1, data2, statistic='mean_difference', **resampling)
+                    ))
+
     elif test_type == "One-way ANOVA":
         if not categorical_cols:
             st.warning("No categorical columns available for grouping.")
@@ -149,6 +224,60 @@ def show_effect_size_analysis(df):
             st.write(f"Effect Size ({results['metric']}): {results['value']:.4f}")
             st.write(f"Interpretation: {results['interpretation']}")
 
+        resampling = show_resampling_options("effect_size", len(df) * 2)
+        if resampling:
+            data1, data2 = df[col1].dropna(), df[col2].dropna()
+            for statistic in ('cohens_d', 'mean_difference'):
+                display_bootstrap_results(get_resampling_result(
+                    df, ('bootstrap', statistic, col1, col2), resampling,
+                    lambda: bootstrap_ci(data1, data2, statistic=statistic, **resampling)
+                ))
+
+def show_resampling_options(key, n_values):
+    """
+    Resampling controls; returns keyword arguments for the resampling engine, or None if disabled.
+
+    n_values is the number of values resampled per draw. The default number of resamples
+    shrinks for large samples, and runs over budget need confirmation.
+    """
+    if not st.checkbox("Resampling inference (permutation test / bootstrap CI)", key=f"{key}_resampling"):
+        return None
+
+    default = int(min(10_000, max(100, RESAMPLE_BUDGET_ELEMENTS // max(n_values, 1) // 100 * 100)))
+    col1, col2, col3 = st.columns(3)
+    n_resamples = col1.number_input(
+        "Resamples", min_value=100, max_value=100_000, value=default, step=100, key=f"{key}_resamples"
+    )
+    seed = col2.number_input("Seed", min_value=0, value=0, step=1, key=f"{key}_seed")
+    parallel = col3.checkbox("Use all CPU cores", key=f"{key}_parallel")
+
+    elements = int(n_resamples) * n_values
+    if elements > RESAMPLE_BUDGET_ELEMENTS:
+        seconds = elements * RESAMPLE_NANOS_PER_ELEMENT / 1e9
+        duration = f"{seconds:.0f} seconds" if seconds < 120 else f"{seconds / 60:.0f} minutes"
+        st.warning(
+            f"{int(n_resamples):,} resamples of {n_values:,} values may take about {duration} "
+            f"per test. Use fewer resamples or the interactive sample to speed this up."
+        )
+        if not st.checkbox("Run anyway", key=f"{key}_confirm"):
+            return None
+    return {
+        'n_resamples': int(n_resamples),
+        'seed': int(seed),
+        'n_jobs': (os.cpu_count() or 1) if parallel else 1
+    }
+
+def display_bootstrap_results(results):
+    if 'error' in results:
+        st.error(f"Error computing bootstrap interval: {results['error']}")
+        return
+
+    st.write(
+        f"{results['metric']}: {results['value']:.4f}, "
+        f"{results['confidence']:.0%} bootstrap CI [{results['ci_lower']:.4f}, {results['ci_upper']:.4f}] "
+        f"({results['n_resamples']:,} resamples)"
+    )
+
 def display_test_results(results):
     if 'error' in results:
         st.error(f"Error performing test: {results['error']}")
@@ -2,9 +2,64 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from utils import get_numeric_columns
+from components.data_export import show_export_controls
+from components.figure_cache import get_figure
+from components.sampling import get_interactive_view
+from utils import (
+    get_numeric_columns,
+    profile_correlation,
+    profile_basic_stats,
+    profile_group_stats
+)
+
+def get_cached_profile(df):
+    """Return the incrementally maintained profile if df is the loaded dataset"""
+    if df is st.session_state.get('data'):
+        return st.session_state.get('profile')
+    return None
+
+def build_correlation_heatmap(corr_matrix):
+    """Correlation heatmap figure"""
+    fig = go.Figure(data=go.Heatmap(
+        z=corr_matrix,
+        x=corr_matrix.columns,
+        y=corr_matrix.columns,
+        colorscale='RdBu',
+        zmin=-1,
+        zmax=1
+    ))
+
+    fig.update_layout(
+        title="Correlation Heatmap",
+        width=700,
+        height=700,
+        xaxis_title="Features",
+        yaxis_title="Features"
+    )
+    return fig
+
+def build_group_bar(grouped_data, group_col, agg_col, agg_func):
+    """Bar chart of an aggregated column per group"""
+    fig = go.Figure(data=go.Bar(
+        x=grouped_data.index,
+        y=grouped_data.values
+    ))
+
+    fig.update_layout(
+        title=f"{agg_func.capitalize()} of {agg_col} by {group_col}",
+        xaxis_title=group_col,
+        yaxis_title=f"{agg_func.capitalize()} of {agg_col}",
+        showlegend=False
+    )
+    return fig
 
 def show_analysis_section(df):
+    """
+    Display the analysis section for the unsampled view df.
+
+    Statistics come from the exact incremental profile when it covers df;
+    otherwise they are computed on the interactive sample.
+    """
     st.header("Data Analysis")
 
     analysis_type = st.selectbox(
@@ -12,6 +67,10 @@ def show_analysis_section(df):
         ["Correlation Analysis", "Basic Statistics", "Group Analysis"]
     )
 
+    profile = get_cached_profile(df)
+    if profile is None:
+        df = get_interactive_view(df, key="analysis")
+
     if analysis_type == "Correlation Analysis":
         numeric_cols = get_numeric_columns(df)
 
@@ -21,30 +80,22 @@ def show_analysis_section(df):
 
         try:
             # Correlation matrix calculation
-            corr_matrix = df[numeric_cols].corr()
+            if profile is not None:
+                corr_matrix = profile_correlation(profile)
+            else:
+                corr_matrix = df[numeric_cols].corr()
 
             # Display correlation matrix as a table
             st.subheader("Correlation Matrix")
             st.dataframe(corr_matrix.round(3))
+            show_export_controls(corr_matrix, "correlation_matrix", key="export_corr", index=True)
 
             # Correlation heatmap using plotly
-            fig = go.Figure(data=go.Heatmap(
-                z=corr_matrix,
-                x=corr_matrix.columns,
-                y=corr_matrix.columns,
-                colorscale='RdBu',
-                zmin=-1,
-                zmax=1
-            ))
-
-            fig.update_layout(
-                title="Correlation Heatmap",
-                width=700,
-                height=700,
-                xaxis_title="Features",
-                yaxis_title="Features"
+            fig = get_figure(
+                df,
+                ("correlation_heatmap", tuple(numeric_cols)),
+                lambda: build_correlation_heatmap(corr_matrix)
             )
-
             st.plotly_chart(fig, use_container_width=True)
 
         except Exception as e:
@@ -62,14 +113,30 @@ def show_analysis_section(df):
 
             with col1:
                 st.subheader("Central Tendency")
-                central_tendency = df[numeric_cols].agg(['mean', 'median']).round(3)
+                if profile is not None:
+                    central_tendency = pd.concat([
+                        profile_basic_stats(profile).loc[['mean']],
+                        df[numeric_cols].agg(['median'])
+                    ]).round(3)
+                else:
+                    central_tendency = df[numeric_cols].agg(['mean', 'median']).round(3)
                 st.dataframe(central_tendency)
 
             with col2:
                 st.subheader("Dispersion")
-                dispersion = df[numeric_cols].agg(['std', 'min', 'max']).round(3)
+                if profile is not None:
+                    dispersion = profile_basic_stats(profile).loc[['std', 'min', 'max']].round(3)
+                else:
+                    dispersion = df[numeric_cols].agg(['std', 'min', 'max']).round(3)
                 st.dataframe(dispersion)
 
+            show_export_controls(
+                pd.concat([central_tendency, dispersion]),
+                "basic_statistics",
+                key="export_basic_stats",
+                index=True
+            )
+
         except Exception as e:
             st.error(f"Error in basic statistics calculation: {str(e)}")
             return
@@ -90,24 +157,21 @@ def show_analysis_section(df):
                 ["mean", "sum", "count", "min", "max"]
             )
 
-            grouped_data = df.groupby(group_col)[agg_col].agg(agg_func)
+            if profile is not None and group_col in profile['groups']:
+                grouped_data = profile_group_stats(profile, group_col, agg_col, agg_func)
+            else:
+                grouped_data = df.groupby(group_col)[agg_col].agg(agg_func)
 
             st.subheader(f"{agg_func.capitalize()} of {agg_col} by {group_col}")
             st.dataframe(grouped_data)
+            show_export_controls(grouped_data, f"{agg_func}_{agg_col}_by_{group_col}", key="export_group", index=True)
 
             # Visualization of grouped data
-            fig = go.Figure(data=go.Bar(
-                x=grouped_data.index,
-                y=grouped_data.values
-            ))
-
-            fig.update_layout(
-                title=f"{agg_func.capitalize()} of {agg_col} by {group_col}",
-                xaxis_title=group_col,
-                yaxis_title=f"{agg_func.capitalize()} of {agg_col}",
-                showlegend=False
+            fig = get_figure(
+                df,
+                ("group_bar", group_col, agg_col, agg_func),
+                lambda: build_group_bar(grouped_data, group_col, agg_col, agg_func)
             )
-
             st.plotly_chart(fig, use_container_width=True)
 
         except Exception as e:
@@ -1,6 +1,82 @@
 import streamlit as st
 import pandas as pd
-from utils import get_numeric_columns, get_categorical_columns, calculate_summary_stats
+from components.data_export import show_export_controls
+from components.sampling import get_interactive_view
+from components.figure_cache import get_dataset_hash
+from utils import (
+    get_numeric_columns,
+    get_categorical_columns,
+    calculate_summary_stats,
+    calculate_approximate_summary_stats,
+    apply_filters,
+    FILTER_OPERATORS
+)
+
+# Datasets with at least this many rows default to sketch-based statistics
+APPROXIMATE_STATS_ROWS = 1_000_000
+# Columns with more distinct values than this get a free-text value input
+MAX_FILTER_CHOICES = 1000
+
+def get_filter_state(df):
+    """Return the filter state for df, resetting it when a different dataset is loaded"""
+    state = st.session_state.get('filter_state')
+    if state is None or state['data'] is not df:
+        state = {'data': df, 'predicates': (), 'cache': {}, 'view': df}
+        st.session_state.filter_state = state
+    return state
+
+def get_filtered_view(df):
+    """Return the explorer's filtered view of df (df itself when no filters are active)"""
+    return get_filter_state(df)['view']
+
+def show_filter_builder(df):
+    """Render the filter builder and return the selected predicates as a tuple"""
+    numeric_cols = get_numeric_columns(df)
+    num_filters = st.number_input("Number of filters", min_value=0, max_value=10, value=0, step=1)
+
+    predicates = []
+    for i in range(int(num_filters)):
+        col1, col2, col3 = st.columns([2, 1, 3])
+        column = col1.selectbox("Column", df.columns.tolist(), key=f"filter_col_{i}")
+        operators = FILTER_OPERATORS if column in numeric_cols else [op for op in FILTER_OPERATORS if op != 'between']
+        op = col2.selectbox("Operator", operators, key=f"filter_op_{i}")
+        series = df[column]
+
+        if op == 'between':
+            low, high = float(series.min()), float(series.max())
+            if low < high:
+                value = col3.slider("Range", low, high, (low, high), key=f"filter_range_{i}")
+            else:
+                col3.write(f"All values equal {low}")
+                value = (low, high)
+        elif op in ('==', '!=', 'isin'):
+            if column in numeric_cols:
+                if op == 'isin':
+                    text = col3.text_input("Values (comma separated)", key=f"filter_values_{i}")
+                    value = tuple(float(v) for v in text.split(',') if v.strip())
+                else:
+                    value = col3.number_input("Value", value=float(series.min()), key=f"filter_value_{i}")
+            elif series.nunique() <= MAX_FILTER_CHOICES:
+                choices = sorted(series.dropna().unique().tolist(), key=str)
+                if op == 'isin':
+                    value = tuple(col3.multiselect("Values", choices, key=f"filter_values_{i}"))
+                else:
+                    value = col3.selectbox("Value", choices, key=f"filter_value_{i}")
+            else:
+                text = col3.text_input("Value(s)", key=f"filter_value_{i}")
+                value = tuple(v.strip() for v in text.split(',')) if op == 'isin' else text
+        elif op == 'contains':
+            value = col3.text_input("Text", key=f"filter_text_{i}")
+            if not value:
+                continue
+        else:
+            value = None
+
+        if op == 'isin' and not value:
+            continue
+        predicates.append((column, op, value))
+
+    return tuple(predicates)
 
 def show_explorer_section(df):
     """Display and handle the data explorer section of the Streamlit app."""
@@ -17,7 +93,19 @@ def show_explorer_section(df):
         # Summary statistics
         st.subheader("Summary Statistics")
         try:
-            numeric_stats, categorical_stats, missing_values = calculate_summary_stats(df)
+            stats_mode = st.radio(
+                "Statistics mode",
+                ["Exact", "Approximate (sketches)"],
+                index=int(len(df) >= APPROXIMATE_STATS_ROWS),
+                horizontal=True,
+                help="Approximate mode uses HyperLogLog distinct counts, heavy-hitter top values "
+                     "and KLL quantiles, which stay small on huge and high-cardinality columns"
+            )
+            if stats_mode == "Exact":
+                numeric_stats, categorical_stats, missing_values = calculate_summary_stats(df)
+            else:
+                sketches = st.session_state.get('sketches') if df is st.session_state.get('data') else None
+                numeric_stats, categorical_stats, missing_values = calculate_approximate_summary_stats(df, sketches)
 
             tab1, tab2, tab3 = st.tabs(["Numeric Stats", "Categorical Stats", "Missing Values"])
 
@@ -43,6 +131,22 @@ def show_explorer_section(df):
         except Exception as e:
             st.error(f"Error calculating summary statistics: {str(e)}")
 
+        # Filter builder
+        st.subheader("Filters")
+        try:
+            state = get_filter_state(df)
+            predicates = show_filter_builder(df)
+            if predicates != state['predicates']:
+                mask = apply_filters(df, predicates, state['cache'])
+                state['view'] = df if mask.all() else df[mask]
+                state['predicates'] = predicates
+            view = state['view']
+            if view is not df:
+                st.info(f"Filtered view: {len(view)} of {len(df)} rows. Visualizations and analysis use this view.")
+        except Exception as e:
+            st.error(f"Error applying filters: {str(e)}")
+            view = df
+
         # Data viewer with filters
         st.subheader("Data Viewer")
 
@@ -63,8 +167,9 @@ def show_explorer_section(df):
         sort_order = st.radio("Sort order", ["Ascending", "Descending"])
 
         try:
-            # Filter data
-            filtered_df = df[selected_columns].sort_values(
+            # Filter data (previewing the interactive sample for large views)
+            preview = get_interactive_view(view, key="explorer")
+            filtered_df = preview[selected_columns].sort_values(
                 by=sort_column,
                 ascending=(sort_order == "Ascending")
             )
@@ -78,5 +183,18 @@ def show_explorer_section(df):
         except Exception as e:
             st.error(f"Error processing data: {str(e)}")
 
+        # Export
+        st.subheader("Export")
+        export_choice = st.radio("Data to export", ["Full dataset", "Filtered view"], horizontal=True)
+        if export_choice == "Full dataset":
+            show_export_controls(df, "dataset", key="export_dataset", prepare=True)
+        else:
+            # The column selection builds a new frame each rerun, so key the prepared file on its inputs
+            predicates = get_filter_state(df)['predicates'] if view is not df else ()
+            show_export_controls(
+                view[selected_columns], "filtered_view", key="export_view", prepare=True,
+                data_key=(get_dataset_hash(df), predicates, tuple(selected_columns))
+            )
+
     except Exception as e:
         st.error(f"Error in data explorer: {str(e)}")
\ No newline at end of file
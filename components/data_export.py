@@ -0,0 +1,47 @@
+import streamlit as st
+import pandas as pd
+from components.figure_cache import get_dataset_hash
+from utils import export_data, EXPORT_FORMATS
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def show_export_controls(data, name, key, index=False, prepare=False, data_key=None):
+    """
+    Offer a DataFrame or Series for download in any supported export format.
+
+    With prepare=True the file is only serialized after the user asks for it,
+    which keeps reruns cheap for large datasets. data_key identifies the content
+    across reruns when data is rebuilt each time (defaults to its content hash).
+    """
+    col1, col2 = st.columns([1, 2])
+    fmt = col1.selectbox("Export format", EXPORT_FORMATS, key=f"{key}_format")
+    file_name = f"{name}.{fmt}"
+
+    try:
+        if prepare:
+            if data_key is None:
+                data_key = get_dataset_hash(data.to_frame() if isinstance(data, pd.Series) else data)
+            prepared = st.session_state.get(f"{key}_prepared")
+            if col2.button("Prepare download", key=f"{key}_prepare"):
+                with st.spinner("Preparing export..."):
+                    prepared = (file_name, data_key, export_data(data, fmt, index=index))
+                st.session_state[f"{key}_prepared"] = prepared
+            # Drop a prepared file once the format or the underlying data changes
+            if prepared is None or prepared[:2] != (file_name, data_key):
+                return
+            payload = prepared[2]
+        else:
+            payload = export_data(data, fmt, index=index)
+
+        col2.download_button(
+            "Download",
+            data=payload,
+            file_name=file_name,
+            key=f"{key}_download"
+        )
+    except Exception as e:
+        st.error(f"Error exporting data: {str(e)}")
+        logger.error(f"Error exporting {name}: {str(e)}")
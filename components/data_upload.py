@@ -1,6 +1,25 @@
 import streamlit as st
-from utils import load_data
-from database import Dataset, get_session, init_db
+import pandas as pd
+from utils import (
+    load_data,
+    load_bulk_data,
+    read_columns,
+    parse_datetime_columns,
+    compute_profile,
+    update_profile,
+    build_dataset_sketches,
+    update_dataset_sketches
+)
+from sketches import merge_sketches
+from database import (
+    init_db,
+    submit_read,
+    list_datasets,
+    load_dataset,
+    save_dataset,
+    append_dataset
+)
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
 import logging
 
@@ -8,12 +27,52 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# File extensions accepted by the uploaders (compressed files must be CSV or JSON lines)
+UPLOAD_TYPES = [
+    "csv", "xlsx", "xls", "parquet", "pq", "feather", "arrow", "ipc",
+    "jsonl", "ndjson", "gz", "zst", "bz2", "xz"
+]
+
+# Seconds a rerun waits on a background database read before rendering without it
+LISTING_WAIT_SECONDS = 2
+LOAD_WAIT_SECONDS = 2
+
+def wait_for_read(key, submit, timeout):
+    """
+    Return the result of the background read stored under key, starting it with submit() if none is pending.
+
+    Returns None if the read is still running after timeout seconds; it keeps running
+    and is picked up by a later rerun.
+    """
+    future = st.session_state.get(key)
+    if future is None:
+        future = submit()
+        st.session_state[key] = future
+    try:
+        result = future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        return None
+    except Exception:
+        del st.session_state[key]
+        raise
+    del st.session_state[key]
+    return result
+
+def request_load(dataset_id, version, name):
+    """Queue a background load of a dataset version; show_existing_datasets picks it up"""
+    st.session_state.pop('load_read', None)
+    st.session_state.pending_load = (dataset_id, version, name)
+
+def read_dataset(dataset_id, version):
+    """Load a stored dataset version with datetime columns parsed (runs on the read pool)"""
+    return parse_datetime_columns(load_dataset(dataset_id, version=version))
+
 def show_upload_section():
     """
     Display and handle the data upload section of the Streamlit app.
     """
     st.header("Data Upload")
-    st.write("Upload your data file (CSV or Excel)")
+    st.write("Upload your data file (CSV, Excel, Parquet, Feather/Arrow or JSON lines; CSV may be gzip/zstd compressed)")
 
     try:
         # Initialize database if needed
@@ -26,60 +85,230 @@ def show_upload_section():
 
     uploaded_file = st.file_uploader(
         "Choose a file",
-        type=["csv", "xlsx", "xls"],
-        help="Upload a CSV or Excel file"
+        type=UPLOAD_TYPES,
+        help="Upload a CSV, Excel, Parquet, Feather/Arrow or JSON lines file"
     )
 
     if uploaded_file is not None:
         try:
-            # Load data into pandas DataFrame
-            data = load_data(uploaded_file)
-            logger.info(f"Successfully loaded data from {uploaded_file.name}")
-
-            # Store in database
-            with get_session() as session:
-                dataset = Dataset.from_pandas(data, uploaded_file.name)
-                session.add(dataset)
-                session.commit()
+            # Column projection: only the selected columns are read from the file
+            all_columns = read_columns(uploaded_file)
+            columns = st.multiselect("Columns to load", all_columns, default=all_columns)
+            if not columns:
+                st.warning("Please select at least one column to load.")
+                return
+
+            # Read and store only once the columns are chosen, and each file/projection only once
+            upload_key = (uploaded_file.file_id, tuple(columns))
+            if st.session_state.get('upload_key') == upload_key:
+                st.info(f"{uploaded_file.name} is loaded and saved with the selected columns.")
+            elif st.button("Load", key="upload_load", help="Read the selected columns and save them to the database"):
+                # Load data into pandas DataFrame
+                data = load_data(uploaded_file, columns=None if columns == all_columns else columns)
+                logger.info(f"Successfully loaded data from {uploaded_file.name}")
+
+                # Store in database
+                with st.spinner("Saving to database..."):
+                    dataset_id = save_dataset([(None, data)], uploaded_file.name)
                 logger.info(f"Successfully saved dataset {uploaded_file.name} to database")
+                # Record the upload right away so a failure below cannot store it again on rerun
+                st.session_state.upload_key = upload_key
 
                 # Store dataset ID in session state
-                st.session_state.current_dataset_id = dataset.id
+                st.session_state.current_dataset_id = dataset_id
+                st.session_state.current_dataset_name = uploaded_file.name
+                st.session_state.current_version = 1
                 st.session_state.data = data
+                st.session_state.profile = compute_profile(data)
+                st.session_state.sketches = build_dataset_sketches(data)
 
-            st.success("Data uploaded successfully and saved to database!")
-            st.write("Dataset Shape:", data.shape)
-            st.write("Preview of the data:")
-            st.dataframe(data.head())
+                st.success("Data uploaded successfully and saved to database!")
+                st.write("Dataset Shape:", data.shape)
+                st.write("Preview of the data:")
+                st.dataframe(data.head())
 
         except Exception as e:
             st.error(f"Error processing data: {str(e)}")
             logger.error(f"Error processing data: {str(e)}")
             return
 
-    # Show existing datasets
+    show_bulk_import_section()
+
+    if st.session_state.get('current_dataset_id') is not None:
+        show_append_section()
+
+    show_existing_datasets()
+
+def show_existing_datasets():
+    """
+    List stored datasets and load a selected version, reading from the database in the background.
+    """
     try:
-        with get_session() as session:
-            datasets = session.query(Dataset).all()
-            if datasets:
-                st.subheader("Existing Datasets")
-                for dataset in datasets:
-                    col1, col2, col3 = st.columns([2, 2, 1])
-                    with col1:
-                        st.write(f"Name: {dataset.name}")
-                    with col2:
-                        st.write(f"Uploaded: {dataset.upload_date.strftime('%Y-%m-%d %H:%M')}")
-                    with col3:
-                        if st.button("Load", key=f"load_{dataset.id}"):
-                            try:
-                                data = dataset.to_pandas()
-                                st.session_state.current_dataset_id = dataset.id
-                                st.session_state.data = data
-                                st.success(f"Loaded dataset: {dataset.name}")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"Error loading dataset: {str(e)}")
-                                logger.error(f"Error loading dataset {dataset.name}: {str(e)}")
+        datasets = wait_for_read('datasets_read', lambda: submit_read(list_datasets), LISTING_WAIT_SECONDS)
+        if datasets is None:
+            # Slow database: show the last listing we got and pick up the new one on a later rerun
+            datasets = st.session_state.get('datasets_listing', [])
+            st.info("Waiting for the database; the dataset list may be out of date.")
+            st.button("Refresh", key="refresh_datasets")
+        else:
+            st.session_state.datasets_listing = datasets
+
+        if datasets:
+            st.subheader("Existing Datasets")
+            for dataset in datasets:
+                col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+                with col1:
+                    st.write(f"Name: {dataset.name}")
+                with col2:
+                    st.write(f"Uploaded: {dataset.upload_date.strftime('%Y-%m-%d %H:%M')}")
+                with col3:
+                    version = st.selectbox(
+                        "Version",
+                        list(range(dataset.version, 0, -1)),
+                        key=f"version_{dataset.id}",
+                        label_visibility="collapsed"
+                    )
+                with col4:
+                    if st.button("Load", key=f"load_{dataset.id}"):
+                        request_load(dataset.id, version, dataset.name)
     except Exception as e:
         st.error(f"Error accessing existing datasets: {str(e)}")
-        logger.error(f"Error accessing existing datasets: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error accessing existing datasets: {str(e)}")
+
+    pending = st.session_state.get('pending_load')
+    if pending is None:
+        return
+    dataset_id, version, name = pending
+    try:
+        with st.spinner(f"Loading {name}..."):
+            data = wait_for_read(
+                'load_read', lambda: submit_read(read_dataset, dataset_id, version), LOAD_WAIT_SECONDS
+            )
+        if data is None:
+            st.info(f"Still loading {name}; it will open once the database responds.")
+            st.button("Check again", key="check_load")
+            return
+        del st.session_state.pending_load
+        st.session_state.current_dataset_id = dataset_id
+        st.session_state.current_dataset_name = name
+        st.session_state.current_version = version
+        st.session_state.data = data
+        st.session_state.profile = compute_profile(data)
+        st.session_state.sketches = build_dataset_sketches(data)
+        st.success(f"Loaded dataset: {name}")
+        st.rerun()
+    except Exception as e:
+        st.session_state.pop('pending_load', None)
+        st.error(f"Error loading dataset: {str(e)}")
+        logger.error(f"Error loading dataset {name}: {str(e)}")
+
+def show_bulk_import_section():
+    """
+    Import multiple files, zip archives and workbook sheets as one partitioned dataset.
+    """
+    st.subheader("Bulk Import")
+    st.write("Upload several data files or zip archives; every workbook sheet is imported")
+
+    uploaded_files = st.file_uploader(
+        "Choose files",
+        type=UPLOAD_TYPES + ["zip"],
+        accept_multiple_files=True,
+        key="bulk_uploader"
+    )
+    dataset_name = st.text_input("Dataset name", value="Bulk import", key="bulk_name")
+
+    if not uploaded_files or not st.button("Import files"):
+        return
+
+    try:
+        with st.spinner("Parsing files in parallel..."):
+            partitions = load_bulk_data(uploaded_files)
+        logger.info(f"Parsed {len(partitions)} partitions from {len(uploaded_files)} uploaded files")
+
+        with st.spinner("Saving to database..."):
+            dataset_id = save_dataset(partitions, dataset_name)
+        logger.info(f"Successfully saved partitioned dataset {dataset_name} to database")
+
+        st.session_state.current_dataset_id = dataset_id
+        st.session_state.current_dataset_name = dataset_name
+
+        data = pd.concat([df for _, df in partitions], ignore_index=True)
+        st.session_state.current_version = 1
+        st.session_state.data = data
+        st.session_state.profile = compute_profile(data)
+        # Sketch each partition and merge, as it would be done while streaming
+        sketches = build_dataset_sketches(partitions[0][1])
+        for _, df in partitions[1:]:
+            sketches = merge_sketches(sketches, build_dataset_sketches(df))
+        st.session_state.sketches = sketches
+
+        st.success(f"Imported {len(partitions)} partitions as dataset {dataset_name}")
+        st.write("Dataset Shape:", data.shape)
+        st.dataframe(pd.DataFrame(
+            [(label, len(df)) for label, df in partitions],
+            columns=["Partition", "Rows"]
+        ))
+
+    except Exception as e:
+        st.error(f"Error importing files: {str(e)}")
+        logger.error(f"Error importing files: {str(e)}")
+
+def show_append_section():
+    """
+    Append new rows to the currently loaded dataset as a new version.
+    """
+    st.subheader("Append Data")
+    st.write("Add new rows to the current dataset without re-uploading its history")
+
+    appended_file = st.file_uploader(
+        "Choose a file to append",
+        type=UPLOAD_TYPES,
+        key="append_uploader"
+    )
+
+    if appended_file is None:
+        return
+
+    if st.session_state.get('appended_file') == appended_file.file_id:
+        return
+
+    try:
+        delta = load_data(appended_file)
+
+        dataset_id = st.session_state.current_dataset_id
+        with st.spinner("Saving to database..."):
+            new_version = append_dataset(dataset_id, delta)
+        logger.info(f"Appended {len(delta)} rows to dataset {dataset_id} as version {new_version}")
+        is_latest = st.session_state.get('current_version') == new_version - 1
+
+        if is_latest:
+            # Extend the loaded frame and cached profile from the delta only
+            delta = delta[st.session_state.data.columns]
+            data = pd.concat([st.session_state.data, delta], ignore_index=True)
+            try:
+                profile = update_profile(st.session_state.profile, delta)
+            except Exception as e:
+                logger.warning(f"Incremental profile update failed, recomputing: {str(e)}")
+                profile = compute_profile(data)
+            try:
+                sketches = update_dataset_sketches(st.session_state.sketches, delta)
+            except Exception as e:
+                logger.warning(f"Incremental sketch update failed, rebuilding: {str(e)}")
+                sketches = build_dataset_sketches(data)
+
+            st.session_state.current_version = new_version
+            st.session_state.data = data
+            st.session_state.profile = profile
+            st.session_state.sketches = sketches
+            st.session_state.appended_file = appended_file.file_id
+            st.success(f"Appended {len(delta)} rows as version {new_version}")
+            st.write("Dataset Shape:", data.shape)
+        else:
+            # An older version is loaded, so load the new version from the stored chunks in the background
+            st.session_state.appended_file = appended_file.file_id
+            st.success(f"Appended {len(delta)} rows as version {new_version}")
+            request_load(dataset_id, new_version, st.session_state.get('current_dataset_name', f"dataset {dataset_id}"))
+
+    except Exception as e:
+        st.error(f"Error appending data: {str(e)}")
+        logger.error(f"Error appending data: {str(e)}")
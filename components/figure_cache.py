@@ -0,0 +1,109 @@
+import streamlit as st
+import numpy as np
+import plotly.io as pio
+import weakref
+from collections import OrderedDict
+from threading import Lock
+from utils import dataset_fingerprint
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Maximum number of figures kept across all sessions
+FIGURE_CACHE_SIZE = 64
+# Maximum total size of trace data kept across all sessions
+FIGURE_CACHE_BYTES = 256 * 1024 * 1024
+# Estimated size of one non-numeric trace value (strings, timestamps)
+OBJECT_VALUE_BYTES = 64
+# Trace attributes holding data arrays
+DATA_ARRAY_ATTRIBUTES = ('x', 'y', 'z')
+
+_figure_cache = OrderedDict()
+_figure_cache_bytes = 0
+_figure_cache_lock = Lock()
+
+try:
+    # orjson serializes NumPy arrays natively, which is much faster than the default encoder
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+def get_dataset_hash(df):
+    """Return the content hash of df, computed once per DataFrame object in this session"""
+    hashes = st.session_state.setdefault('dataset_hashes', {})
+    entry = hashes.get(id(df))
+    if entry is None or entry[0]() is not df:
+        # Frames are only weakly referenced; forget the ones that have been freed
+        for key in [key for key, (ref, _) in hashes.items() if ref() is None]:
+            del hashes[key]
+        entry = (weakref.ref(df), dataset_fingerprint(df))
+        hashes[id(df)] = entry
+    return entry[1]
+
+def figure_nbytes(fig):
+    """Approximate size of a figure's trace data arrays"""
+    total = 0
+    for trace in fig.data:
+        for attr in DATA_ARRAY_ATTRIBUTES:
+            if attr not in trace or trace[attr] is None:
+                continue
+            values = trace[attr]
+            if isinstance(values, np.ndarray) and values.dtype.kind in 'iufb':
+                total += values.nbytes
+            else:
+                total += len(values) * OBJECT_VALUE_BYTES
+    return total
+
+def compact_figure(fig):
+    """
+    Store trace data as typed NumPy arrays, narrowing integer arrays where lossless.
+
+    Plotly 6+ serializes typed arrays as base64 binary buffers instead of JSON lists.
+    """
+    for trace in fig.data:
+        for attr in DATA_ARRAY_ATTRIBUTES:
+            if attr not in trace or trace[attr] is None:
+                continue
+            values = np.asarray(trace[attr])
+            if values.dtype.kind not in 'iufb':
+                continue
+            if values.dtype.kind in 'iu' and values.size:
+                int32 = np.iinfo(np.int32)
+                if int32.min <= values.min() and values.max() <= int32.max:
+                    values = values.astype(np.int32)
+            # Plotly ignores assignments that compare equal, so clear the old array first
+            trace[attr] = None
+            trace[attr] = np.ascontiguousarray(values)
+    return fig
+
+def get_figure(df, spec, build):
+    """
+    Return the figure for (dataset hash, chart spec), calling build() only on a cache miss.
+
+    spec must be hashable and capture every input of build besides df itself.
+    The cache is bounded by figure count and by total trace data size.
+    """
+    global _figure_cache_bytes
+    key = (get_dataset_hash(df), spec)
+    with _figure_cache_lock:
+        entry = _figure_cache.get(key)
+        if entry is not None:
+            _figure_cache.move_to_end(key)
+            return entry[0]
+
+    fig = compact_figure(build())
+    nbytes = figure_nbytes(fig)
+    logger.info(f"Built figure for {spec[0]} ({nbytes / 1e6:.1f} MB of trace data)")
+    if nbytes > FIGURE_CACHE_BYTES:
+        return fig
+    with _figure_cache_lock:
+        if key not in _figure_cache:
+            _figure_cache[key] = (fig, nbytes)
+            _figure_cache_bytes += nbytes
+        while len(_figure_cache) > FIGURE_CACHE_SIZE or _figure_cache_bytes > FIGURE_CACHE_BYTES:
+            _, (_, evicted) = _figure_cache.popitem(last=False)
+            _figure_cache_bytes -= evicted
+    return fig
@@ -0,0 +1,79 @@
+import streamlit as st
+from utils import build_sample, get_categorical_columns, DEFAULT_SAMPLE_SIZE
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Datasets with at least this many rows start in sampling mode
+SAMPLE_AUTO_ROWS = 100_000
+# Categorical columns with more distinct values than this are not offered for stratification
+MAX_STRATA = 100
+
+def get_strata_columns(df):
+    """Return the low-cardinality categorical columns of df, computed once per dataset"""
+    cached = st.session_state.get('strata_cache')
+    if cached is None or cached['data'] is not df:
+        columns = [col for col in get_categorical_columns(df) if df[col].nunique() <= MAX_STRATA]
+        cached = {'data': df, 'columns': columns}
+        st.session_state.strata_cache = cached
+    return cached['columns']
+
+def show_sampling_controls(df):
+    """
+    Render the sidebar controls for the interactive sample mode.
+    """
+    st.sidebar.header("Interactive Sample")
+    enabled = st.sidebar.checkbox(
+        "Explore a sample",
+        value=len(df) >= SAMPLE_AUTO_ROWS,
+        key="sample_enabled",
+        help="Use a seeded random sample for previews, charts and exploratory tests"
+    )
+    if not enabled:
+        st.session_state.sample_settings = None
+        return
+
+    size = st.sidebar.number_input(
+        "Sample size", min_value=1_000, value=DEFAULT_SAMPLE_SIZE, step=10_000, key="sample_size"
+    )
+    stratify_col = st.sidebar.selectbox(
+        "Stratify by", ["None"] + get_strata_columns(df), key="sample_stratify",
+        help=f"Categorical columns with at most {MAX_STRATA} distinct values"
+    )
+    seed = st.sidebar.number_input("Seed", min_value=0, value=0, step=1, key="sample_seed")
+
+    st.session_state.sample_settings = {
+        'size': int(size),
+        'stratify_col': None if stratify_col == "None" else stratify_col,
+        'seed': int(seed)
+    }
+
+def get_interactive_view(df, key):
+    """
+    Return the interactive sample of df (built once per dataset and settings) with a banner,
+    or df itself when sampling is off, the frame is small, or the user asked for exact results.
+    """
+    settings = st.session_state.get('sample_settings')
+    if not settings or len(df) <= settings['size']:
+        return df
+
+    cached = st.session_state.get('sample_cache')
+    if cached is None or cached['data'] is not df or cached['settings'] != settings:
+        sample = build_sample(df, settings['size'], settings['seed'], settings['stratify_col'])
+        cached = {'data': df, 'settings': settings, 'sample': sample}
+        st.session_state.sample_cache = cached
+        logger.info(f"Built interactive sample of {len(sample)} rows from {len(df)}")
+    sample = cached['sample']
+
+    col1, col2 = st.columns([4, 1])
+    strategy = f"stratified by {settings['stratify_col']}" if settings['stratify_col'] else "uniform"
+    col1.warning(
+        f"Interactive sample: showing {len(sample):,} of {len(df):,} rows "
+        f"({strategy}, seed {settings['seed']}). Results are approximate."
+    )
+    if col2.button("Compute exactly", key=f"exact_{key}"):
+        st.info(f"Computed exactly on all {len(df):,} rows.")
+        return df
+    return sample
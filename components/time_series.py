@@ -0,0 +1,131 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from components.figure_cache import get_figure
+from utils import (
+    get_numeric_columns,
+    get_datetime_columns,
+    build_time_index,
+    build_preaggregates,
+    choose_resample_frequency,
+    median_spacing,
+    resample_time_series,
+    apply_window,
+    RESAMPLE_FREQUENCIES
+)
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FREQUENCY_LABELS = {
+    's': 'Second', '10s': '10 seconds', 'min': 'Minute', '5min': '5 minutes',
+    '15min': '15 minutes', 'h': 'Hour', '6h': '6 hours', 'D': 'Day',
+    'W': 'Week', 'M': 'Month', 'Q': 'Quarter', 'Y': 'Year'
+}
+
+def get_time_index(df, time_col):
+    """Return the sorted time index, pre-aggregates and median spacing, built once per dataset and column"""
+    cached = st.session_state.get('time_series_cache')
+    if cached is None or cached['data'] is not df or cached['time_col'] != time_col:
+        ts = build_time_index(df, time_col, get_numeric_columns(df))
+        cached = {
+            'data': df,
+            'time_col': time_col,
+            'ts': ts,
+            'preaggs': build_preaggregates(ts),
+            'spacing': median_spacing(ts)
+        }
+        st.session_state.time_series_cache = cached
+        logger.info(f"Built time index on {time_col} with pre-aggregates {list(cached['preaggs'])}")
+    return cached['ts'], cached['preaggs'], cached['spacing']
+
+def show_time_series_section(df):
+    """Display and handle the time series section of the Streamlit app."""
+    st.header("Time Series Analysis")
+
+    datetime_cols = get_datetime_columns(df)
+    numeric_cols = get_numeric_columns(df)
+    if not datetime_cols:
+        st.warning("No datetime columns found in the dataset.")
+        return
+    if not numeric_cols:
+        st.warning("No numeric columns available for analysis.")
+        return
+
+    try:
+        time_col = st.selectbox("Time column", datetime_cols)
+        value_cols = st.multiselect("Value columns", numeric_cols, default=numeric_cols[:1])
+        if not value_cols:
+            st.warning("Please select at least one value column.")
+            return
+
+        ts, preaggs, spacing = get_time_index(df, time_col)
+        if ts.empty:
+            st.warning(f"No timestamps found in {time_col}.")
+            return
+
+        # Zoom range
+        first, last = ts.index[0].to_pydatetime(), ts.index[-1].to_pydatetime()
+        if first < last:
+            step = max((last - first) / 1000, pd.Timedelta(seconds=1).to_pytimedelta())
+            start, end = st.slider(
+                "Time range", min_value=first, max_value=last, value=(first, last), step=step
+            )
+        else:
+            start, end = first, last
+
+        col1, col2 = st.columns(2)
+        with col1:
+            freq_choice = st.selectbox(
+                "Resolution",
+                ["Auto"] + RESAMPLE_FREQUENCIES,
+                format_func=lambda f: f if f == "Auto" else FREQUENCY_LABELS[f]
+            )
+            freq = choose_resample_frequency(start, end, spacing) if freq_choice == "Auto" else freq_choice
+        with col2:
+            how = st.selectbox("Aggregation", ["mean", "sum", "count", "min", "max"])
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            window_type = st.selectbox("Window", ["none", "rolling", "expanding"])
+        with col2:
+            window = st.number_input(
+                "Window length (periods)", min_value=2, value=7, step=1,
+                disabled=(window_type != "rolling")
+            )
+        with col3:
+            window_func = st.selectbox(
+                "Window function", ["mean", "sum", "std", "min", "max"],
+                disabled=(window_type == "none")
+            )
+
+        resampled = resample_time_series(ts, preaggs, freq, how, start, end, columns=value_cols)
+        result = apply_window(resampled, window_type, int(window), window_func)
+        result.index.name = time_col
+        st.write(f"{len(result)} points at {FREQUENCY_LABELS[freq].lower()} resolution")
+
+        title = f"{how.capitalize()} per {FREQUENCY_LABELS[freq].lower()}"
+        if window_type == "rolling":
+            title += f", rolling {window_func} over {int(window)} periods"
+        elif window_type == "expanding":
+            title += f", expanding {window_func}"
+
+        spec = ("time_series", time_col, tuple(value_cols), str(start), str(end), freq, how,
+                window_type, int(window), window_func)
+        fig = get_figure(df, spec, lambda: px.line(
+            result,
+            x=result.index,
+            y=value_cols,
+            labels={'value': 'Value', 'variable': 'Column'},
+            title=title
+        ))
+        st.plotly_chart(fig, use_container_width=True)
+
+        with st.expander("Show data"):
+            st.dataframe(result)
+
+    except Exception as e:
+        st.error(f"Error in time series analysis: {str(e)}")
+        logger.error(f"Error in time series analysis: {str(e)}")
@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, inspect, text
+from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, ForeignKey, inspect, text, func
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import sessionmaker, deferred
+from sqlalchemy.pool import QueuePool
+from concurrent.futures import ThreadPoolExecutor
+import csv
 import os
 from dotenv import load_dotenv
 import pandas as pd
@@ -35,6 +38,34 @@ else:
     sanitized_url = DATABASE_URL.replace('//', '//***:***@')
     logger.info("Database URL found: %s", sanitized_url)
 
+# Connection pool bounds and timeouts (seconds), overridable from the environment
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "30"))
+DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", "300"))
+# Rows per stored chunk when writing a DataFrame
+STORE_CHUNK_ROWS = 100_000
+# Chunk rows per INSERT batch on databases without COPY
+INSERT_BATCH_CHUNKS = 4
+# Characters requested per read while streaming COPY data
+COPY_BUFFER_SIZE = 1 << 20
+# Leading characters of a stored CSV fetched to read its header
+HEADER_PREFIX_CHARS = 1 << 20
+
+def get_connect_args(url):
+    """Driver connect arguments enforcing the connect and statement timeouts"""
+    backend = make_url(url).get_backend_name()
+    if backend == 'postgresql':
+        return {
+            "connect_timeout": DB_CONNECT_TIMEOUT,
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT * 1000}"
+        }
+    if backend == 'sqlite':
+        # Pooled connections are handed to the background read threads
+        return {"timeout": DB_CONNECT_TIMEOUT, "check_same_thread": False}
+    return {}
+
 def create_db_engine(retries=3, delay=2):
     """Create database engine with retry logic"""
     for attempt in range(retries):
@@ -42,10 +73,12 @@ def create_db_engine(retries=3, delay=2):
             logger.info(f"Attempt {attempt + 1} to create database engine")
             engine = create_engine(
                 DATABASE_URL,
-                poolclass=NullPool,
-                connect_args={
-                    "connect_timeout": 30
-                }
+                poolclass=QueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_pre_ping=True,
+                connect_args=get_connect_args(DATABASE_URL)
             )
             # Test the connection
             with engine.connect() as conn:
@@ -69,48 +102,229 @@ Base = declarative_base()
 # Create Session class
 Session = sessionmaker(bind=engine)
 
+# Background threads for database reads, so the script thread can wait with a timeout
+_read_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db-read")
+_db_initialized = False
+
 class Dataset(Base):
     __tablename__ = 'datasets'
 
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     upload_date = Column(DateTime, default=datetime.utcnow)
-    data = Column(String, nullable=False)  # Store CSV data as string
+    data = deferred(Column(String, nullable=False))  # Store CSV data as string (version 1)
 
-    @classmethod
-    def from_pandas(cls, df, name):
-        """Create a Dataset instance from a pandas DataFrame"""
-        try:
-            return cls(
-                name=name,
-                data=df.to_csv(index=False)
-            )
-        except Exception as e:
-            logger.error(f"Error creating Dataset from DataFrame: {str(e)}")
-            raise
+class DatasetChunk(Base):
+    """Extra rows stored under a dataset.
 
-    def to_pandas(self):
-        """Convert stored data back to pandas DataFrame"""
-        try:
-            return pd.read_csv(StringIO(self.data))
-        except Exception as e:
-            logger.error(f"Error converting data to DataFrame: {str(e)}")
-            raise
+    Version 1 chunks hold the rest of the initial upload (row slices of large frames and
+    bulk-import partitions); later versions are appends.
+    """
+    __tablename__ = 'dataset_chunks'
+
+    id = Column(Integer, primary_key=True)
+    dataset_id = Column(Integer, ForeignKey('datasets.id'), nullable=False, index=True)
+    version = Column(Integer, nullable=False)
+    source = Column(String)  # Originating file or sheet for bulk-imported partitions
+    row_count = Column(Integer, nullable=False)
+    upload_date = Column(DateTime, default=datetime.utcnow)
+    data = deferred(Column(String, nullable=False))  # Chunk rows as CSV string
 
 def init_db():
-    """Initialize the database tables"""
+    """Initialize the database tables (once per process)"""
+    global _db_initialized
+    if _db_initialized:
+        return
     try:
         inspector = inspect(engine)
-        if not inspector.has_table('datasets'):
-            logger.info("Creating datasets table")
+        missing = [name for name in Base.metadata.tables if not inspector.has_table(name)]
+        if missing:
+            logger.info(f"Creating tables: {', '.join(missing)}")
             Base.metadata.create_all(engine)
-            logger.info("Datasets table created successfully")
+            logger.info("Database tables created successfully")
         else:
-            logger.info("Datasets table already exists")
+            logger.info("Database tables already exist")
+        _db_initialized = True
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
         raise
 
 def get_session():
     """Get a new database session"""
-    return Session()
\ No newline at end of file
+    return Session()
+
+def submit_read(fn, *args, **kwargs):
+    """Run a database read on the background thread pool and return its Future"""
+    return _read_executor.submit(fn, *args, **kwargs)
+
+def list_datasets():
+    """Return id, name, upload_date and latest version of every dataset, without loading any data"""
+    with get_session() as session:
+        version = func.coalesce(func.max(DatasetChunk.version), 1).label('version')
+        return (
+            session.query(Dataset.id, Dataset.name, Dataset.upload_date, version)
+            .outerjoin(DatasetChunk, DatasetChunk.dataset_id == Dataset.id)
+            .group_by(Dataset.id, Dataset.name, Dataset.upload_date)
+            .order_by(Dataset.id)
+            .all()
+        )
+
+def load_dataset(dataset_id, version=None):
+    """Read a dataset back into a DataFrame, up to the given version, fetching one chunk at a time"""
+    try:
+        with get_session() as session:
+            head = session.query(Dataset.data).filter(Dataset.id == dataset_id).scalar()
+            if head is None:
+                raise ValueError(f"Dataset {dataset_id} does not exist")
+            query = (
+                session.query(DatasetChunk.data)
+                .filter(DatasetChunk.dataset_id == dataset_id)
+                .order_by(DatasetChunk.id)
+            )
+            if version is not None:
+                query = query.filter(DatasetChunk.version <= version)
+            # Parse all chunks as one CSV so dtypes are inferred over the whole dataset
+            return pd.read_csv(_TextStream(_csv_pieces(head, (data for (data,) in query.yield_per(1)))))
+    except Exception as e:
+        logger.error(f"Error loading dataset {dataset_id}: {str(e)}")
+        raise
+
+def _csv_pieces(head, chunks):
+    """Yield the base CSV, then each chunk's rows without its repeated header line"""
+    header = head.partition('\n')[0] + '\n'
+    yield head
+    for data in chunks:
+        if not data.startswith(header):
+            raise ValueError("Stored chunk columns do not match the dataset")
+        if len(data) > len(header):
+            yield data[len(header):]
+
+def _iter_csv_chunks(df):
+    """Yield (row_count, csv) for consecutive STORE_CHUNK_ROWS-row slices of df, serialized one at a time"""
+    for start in range(0, max(len(df), 1), STORE_CHUNK_ROWS):
+        part = df.iloc[start:start + STORE_CHUNK_ROWS]
+        yield len(part), part.to_csv(index=False)
+
+class _TextStream:
+    """Read-only file object over an iterator of non-empty strings (for COPY ... FROM STDIN and read_csv)"""
+
+    def __init__(self, records):
+        self.records = iter(records)
+        self.buffer = ''
+        self.position = 0
+
+    def read(self, size=-1):
+        if self.position >= len(self.buffer):
+            self.buffer, self.position = next(self.records, ''), 0
+        if size is None or size < 0:
+            size = len(self.buffer) - self.position
+        data = self.buffer[self.position:self.position + size]
+        self.position += len(data)
+        return data
+
+def _copy_record(values):
+    """Format one row for COPY in CSV mode; None becomes an unquoted empty field (NULL)"""
+    out = StringIO()
+    csv.writer(out, lineterminator='\n').writerow(values)
+    return out.getvalue()
+
+def _write_chunks(session, dataset_id, version, chunks):
+    """
+    Stream (source, row_count, csv) chunks into dataset_chunks.
+
+    Uses COPY on PostgreSQL with psycopg2 and batched INSERTs elsewhere; either way
+    only the chunk being sent is held as a CSV string.
+    """
+    upload_date = datetime.utcnow()
+    rows = (
+        {
+            'dataset_id': dataset_id,
+            'version': version,
+            'source': source,
+            'row_count': row_count,
+            'upload_date': upload_date,
+            'data': data
+        }
+        for source, row_count, data in chunks
+    )
+    connection = session.connection()
+
+    if connection.dialect.name == 'postgresql' and connection.dialect.driver == 'psycopg2':
+        columns = ['dataset_id', 'version', 'source', 'row_count', 'upload_date', 'data']
+        stream = _TextStream(_copy_record([row[col] for col in columns]) for row in rows)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {DatasetChunk.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                stream,
+                size=COPY_BUFFER_SIZE
+            )
+        finally:
+            cursor.close()
+        return
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_BATCH_CHUNKS:
+            connection.execute(DatasetChunk.__table__.insert(), batch)
+            batch = []
+    if batch:
+        connection.execute(DatasetChunk.__table__.insert(), batch)
+
+def save_dataset(partitions, name):
+    """
+    Store (label, DataFrame) partitions sharing one schema as a new dataset and return its id.
+
+    The first chunk goes in the dataset row; the rest are streamed as version 1 chunks.
+    """
+    try:
+        chunks = (
+            (label, row_count, data)
+            for label, df in partitions
+            for row_count, data in _iter_csv_chunks(df)
+        )
+        with get_session() as session:
+            _, _, head = next(chunks)
+            dataset = Dataset(name=name, data=head)
+            session.add(dataset)
+            session.flush()
+            dataset_id = dataset.id
+            del head, dataset
+            _write_chunks(session, dataset_id, 1, chunks)
+            session.commit()
+        return dataset_id
+    except Exception as e:
+        logger.error(f"Error saving dataset {name}: {str(e)}")
+        raise
+
+def append_dataset(dataset_id, df):
+    """Stream new rows into a dataset as chunks under the next version number, and return that version"""
+    try:
+        with get_session() as session:
+            prefix = (
+                session.query(func.substr(Dataset.data, 1, HEADER_PREFIX_CHARS))
+                .filter(Dataset.id == dataset_id)
+                .scalar()
+            )
+            if prefix is None:
+                raise ValueError(f"Dataset {dataset_id} does not exist")
+            base_columns = pd.read_csv(StringIO(prefix), nrows=0).columns.tolist()
+            if set(df.columns) != set(base_columns):
+                raise ValueError(
+                    f"Appended columns {sorted(df.columns)} do not match dataset columns {sorted(base_columns)}"
+                )
+            latest = (
+                session.query(func.max(DatasetChunk.version))
+                .filter(DatasetChunk.dataset_id == dataset_id)
+                .scalar()
+            )
+            new_version = (latest or 1) + 1
+            _write_chunks(session, dataset_id, new_version, (
+                (None, row_count, data) for row_count, data in _iter_csv_chunks(df[base_columns])
+            ))
+            session.commit()
+        return new_version
+    except Exception as e:
+        logger.error(f"Error appending data to dataset {dataset_id}: {str(e)}")
+        raise
@@ -2,10 +2,12 @@ import streamlit as st
 import pandas as pd
 import logging
 from components.data_upload import show_upload_section
-from components.data_explorer import show_explorer_section
+from components.data_explorer import show_explorer_section, get_filtered_view
 from components.visualizations import show_visualization_section
 from components.analysis import show_analysis_section
 from components.advanced_analysis import show_advanced_analysis_section
+from components.time_series import show_time_series_section
+from components.sampling import show_sampling_controls, get_interactive_view
 from dotenv import load_dotenv
 import os
 
@@ -38,6 +40,13 @@ except Exception as e:
     logger.error(f"Error setting page configuration: {str(e)}")
     raise
 
+def get_active_data(section, sample=True):
+    """Return the (filtered, possibly sampled) view of the loaded dataset used by a section"""
+    data = get_filtered_view(st.session_state.data)
+    if data is not st.session_state.data:
+        st.info(f"Using filtered view: {len(data)} of {len(st.session_state.data)} rows")
+    return get_interactive_view(data, key=section) if sample else data
+
 def main():
     try:
         st.title("📊 Interactive Data Analytics Dashboard")
@@ -46,7 +55,7 @@ def main():
         st.sidebar.header("Navigation")
         page = st.sidebar.radio(
             "Select a Section:",
-            ["Data Upload", "Data Explorer", "Visualizations", "Analysis", "Advanced Analysis"]
+            ["Data Upload", "Data Explorer", "Visualizations", "Time Series", "Analysis", "Advanced Analysis"]
         )
 
         # Initialize session state for data storage
@@ -54,6 +63,9 @@ def main():
             st.session_state.data = None
             logger.info("Session state initialized")
 
+        if st.session_state.data is not None:
+            show_sampling_controls(st.session_state.data)
+
         if page == "Data Upload":
             show_upload_section()
         elif page == "Data Explorer":
@@ -63,17 +75,24 @@ def main():
                 st.warning("Please upload data first!")
         elif page == "Visualizations":
             if st.session_state.data is not None:
-                show_visualization_section(st.session_state.data)
+                show_visualization_section(get_active_data("visualizations"))
+            else:
+                st.warning("Please upload data first!")
+        elif page == "Time Series":
+            if st.session_state.data is not None:
+                # Pre-aggregates keep full-data time series interactive, so no sample is used
+                show_time_series_section(get_active_data("time_series", sample=False))
             else:
                 st.warning("Please upload data first!")
         elif page == "Analysis":
             if st.session_state.data is not None:
-                show_analysis_section(st.session_state.data)
+                # The analysis section samples only when no exact profile covers the view
+                show_analysis_section(get_active_data("analysis", sample=False))
             else:
                 st.warning("Please upload data first!")
         elif page == "Advanced Analysis":
             if st.session_state.data is not None:
-                show_advanced_analysis_section(st.session_state.data)
+                show_advanced_analysis_section(get_active_data("advanced_analysis"))
             else:
                 st.warning("Please upload data first!")
 
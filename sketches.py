@@ -0,0 +1,252 @@
+import pandas as pd
+import numpy as np
+
+# HyperLogLog precision: 2**14 registers, ~0.8% relative error
+HLL_PRECISION = 14
+# Number of heavy hitters tracked per column
+TOP_K_CAPACITY = 100
+# Items kept per KLL compactor level
+KLL_CAPACITY = 200
+# Rows sketched at a time when building from a DataFrame
+SKETCH_CHUNK_ROWS = 1_000_000
+
+QUANTILES = [0.25, 0.5, 0.75]
+
+def _hash_values(values):
+    """64-bit hashes of an array of values"""
+    return pd.util.hash_array(np.asarray(values))
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        return self.update_hashes(_hash_values(values))
+
+    def update_hashes(self, hashes):
+        if hashes.size == 0:
+            return self
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        # Rank = position of the leftmost 1-bit in the remaining bits
+        bit_length = np.zeros(remainder.shape, dtype=np.int64)
+        nonzero = remainder > 0
+        bit_length[nonzero] = np.floor(np.log2(remainder[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = (64 - self.precision - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        merged = HyperLogLog(self.precision)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting for small cardinalities
+            return m * np.log(m / zeros)
+        return raw
+
+class HeavyHitters:
+    """Mergeable top-k summary (Misra-Gries); counts are lower bounds within n / (capacity + 1).
+
+    Counters are keyed by value hash, with one representative value kept per counter.
+    """
+
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.labels = {}
+        self.total = 0
+
+    def _prune(self, counts):
+        """Subtract the (capacity + 1)-th largest count and drop what falls to zero"""
+        if len(counts) > self.capacity:
+            threshold = np.partition(counts.to_numpy(), -(self.capacity + 1))[-(self.capacity + 1)]
+            counts = counts - threshold
+            counts = counts[counts > 0]
+        return counts
+
+    def _absorb(self, counts, labels, total):
+        combined = self._prune(self.counts.add(counts, fill_value=0).astype(np.int64))
+        merged = HeavyHitters(self.capacity)
+        merged.counts = combined
+        merged.labels = {key: self.labels.get(key, labels.get(key)) for key in combined.index}
+        merged.total = self.total + total
+        return merged
+
+    def update(self, values, hashes=None):
+        values = np.asarray(values)
+        hashes = _hash_values(values) if hashes is None else hashes
+        # Reduce the chunk to its own summary first so the merge stays small
+        counts = self._prune(pd.Series(hashes).value_counts())
+        mask = np.isin(hashes, counts.index.to_numpy())
+        firsts = pd.Series(values[mask], index=hashes[mask])
+        labels = firsts[~firsts.index.duplicated()].to_dict()
+        updated = self._absorb(counts, labels, len(values))
+        self.counts, self.labels, self.total = updated.counts, updated.labels, updated.total
+        return self
+
+    def merge(self, other):
+        return self._absorb(other.counts, other.labels, other.total)
+
+    def top(self, k=1):
+        top = self.counts.nlargest(k)
+        return pd.Series(top.to_numpy(), index=[self.labels[key] for key in top.index])
+
+class KLLSketch:
+    """Mergeable quantile sketch built from KLL-style compactors of equal capacity.
+
+    Level h holds items of weight 2**h; a full level is sorted and every other
+    item (from a random offset) is promoted to the next level.
+    """
+
+    def __init__(self, capacity=KLL_CAPACITY, seed=0):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # Keep an odd leftover at this level so promoted items pair up
+                keep = items[:len(items) % 2]
+                promoted = items[len(keep):][self.rng.integers(0, 2)::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.count += values.size
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self._compact()
+        return self
+
+    def merge(self, other):
+        merged = KLLSketch(self.capacity)
+        merged.rng = self.rng
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = [
+            np.concatenate([
+                self.levels[h] if h < len(self.levels) else np.empty(0),
+                other.levels[h] if h < len(other.levels) else np.empty(0)
+            ])
+            for h in range(depth)
+        ]
+        merged.count = self.count + other.count
+        merged.min = min(self.min, other.min)
+        merged.max = max(self.max, other.max)
+        merged._compact()
+        return merged
+
+    def quantiles(self, qs):
+        if self.count == 0:
+            return [np.nan for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side='left')
+        return items[np.minimum(positions, len(items) - 1)].tolist()
+
+class ColumnSketch:
+    """Approximate statistics for one column; mergeable across chunks and partitions"""
+
+    def __init__(self, numeric):
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.quantiles = KLLSketch() if numeric else None
+        self.top = None if numeric else HeavyHitters()
+
+    def update(self, series):
+        values = series.dropna().to_numpy()
+        self.rows += len(series)
+        self.nulls += len(series) - len(values)
+        hashes = _hash_values(values)
+        self.distinct.update_hashes(hashes)
+        if self.numeric:
+            self.quantiles.update(values)
+        else:
+            self.top.update(values, hashes)
+        return self
+
+    def merge(self, other):
+        if other.numeric != self.numeric:
+            raise ValueError("Cannot merge numeric and categorical column sketches")
+        merged = ColumnSketch(self.numeric)
+        merged.rows = self.rows + other.rows
+        merged.nulls = self.nulls + other.nulls
+        merged.distinct = self.distinct.merge(other.distinct)
+        if self.numeric:
+            merged.quantiles = self.quantiles.merge(other.quantiles)
+        else:
+            merged.top = self.top.merge(other.top)
+        return merged
+
+def build_sketches(df, numeric_cols, categorical_cols):
+    """Sketch the given columns of df, chunk by chunk"""
+    sketches = {col: ColumnSketch(True) for col in numeric_cols}
+    sketches.update({col: ColumnSketch(False) for col in categorical_cols})
+    for start in range(0, len(df), SKETCH_CHUNK_ROWS):
+        chunk = df.iloc[start:start + SKETCH_CHUNK_ROWS]
+        for col, sketch in sketches.items():
+            sketch.update(chunk[col])
+    return sketches
+
+def merge_sketches(sketches, other):
+    """Merge two column -> ColumnSketch mappings covering the same columns"""
+    if set(sketches) != set(other):
+        raise ValueError("Cannot merge sketches of different columns")
+    return {col: sketch.merge(other[col]) for col, sketch in sketches.items()}
+
+def summarize_sketches(sketches):
+    """Approximate numeric stats, categorical stats and missing values, shaped like describe()"""
+    numeric = {}
+    categorical = {}
+    for col, sketch in sketches.items():
+        count = sketch.rows - sketch.nulls
+        if sketch.numeric:
+            q25, q50, q75 = sketch.quantiles.quantiles(QUANTILES)
+            numeric[col] = {
+                'count': count,
+                'unique (approx)': round(sketch.distinct.estimate()),
+                'min': sketch.quantiles.min if count else np.nan,
+                '25% (approx)': q25,
+                '50% (approx)': q50,
+                '75% (approx)': q75,
+                'max': sketch.quantiles.max if count else np.nan
+            }
+        else:
+            top = sketch.top.top(1)
+            categorical[col] = {
+                'count': count,
+                'unique (approx)': round(sketch.distinct.estimate()),
+                'top (approx)': top.index[0] if len(top) else None,
+                'freq (lower bound)': int(top.iloc[0]) if len(top) else 0
+            }
+    missing = pd.Series({col: sketch.nulls for col, sketch in sketches.items()}, dtype=np.int64)
+    return pd.DataFrame(numeric), pd.DataFrame(categorical), missing
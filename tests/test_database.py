@@ -0,0 +1,81 @@
+import os
+import tempfile
+
+import pandas as pd
+import pytest
+
+# database reads DATABASE_URL and connects at import time
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+
+import database  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    database.init_db()
+    monkeypatch.setattr(database, 'STORE_CHUNK_ROWS', 3)
+
+
+def make_frame(start, rows):
+    return pd.DataFrame({
+        'id': range(start, start + rows),
+        'value': [i * 0.5 for i in range(start, start + rows)],
+        'label': [f'row {i}' for i in range(start, start + rows)]
+    })
+
+
+def test_save_and_load_round_trip():
+    df = make_frame(0, 10)
+    dataset_id = database.save_dataset([(None, df)], 'single')
+    pd.testing.assert_frame_equal(database.load_dataset(dataset_id), df)
+
+
+def test_partitions_are_stored_in_order():
+    parts = [('a.csv', make_frame(0, 4)), ('b.csv', make_frame(4, 5))]
+    dataset_id = database.save_dataset(parts, 'partitions')
+    expected = pd.concat([df for _, df in parts], ignore_index=True)
+    pd.testing.assert_frame_equal(database.load_dataset(dataset_id), expected)
+
+
+def test_append_creates_versions():
+    base, first, second = make_frame(0, 5), make_frame(5, 4), make_frame(9, 2)
+    dataset_id = database.save_dataset([(None, base)], 'versioned')
+
+    assert database.append_dataset(dataset_id, first) == 2
+    # Column order of the appended frame does not matter
+    assert database.append_dataset(dataset_id, second[['label', 'id', 'value']]) == 3
+
+    pd.testing.assert_frame_equal(database.load_dataset(dataset_id, version=1), base)
+    pd.testing.assert_frame_equal(
+        database.load_dataset(dataset_id, version=2),
+        pd.concat([base, first], ignore_index=True)
+    )
+    pd.testing.assert_frame_equal(
+        database.load_dataset(dataset_id),
+        pd.concat([base, first, second], ignore_index=True)
+    )
+
+    versions = {row.id: row.version for row in database.list_datasets()}
+    assert versions[dataset_id] == 3
+
+
+def test_append_rejects_mismatched_columns():
+    dataset_id = database.save_dataset([(None, make_frame(0, 4))], 'mismatch')
+    with pytest.raises(ValueError):
+        database.append_dataset(dataset_id, make_frame(4, 2).drop(columns='label'))
+
+
+def test_missing_dataset_raises():
+    with pytest.raises(ValueError):
+        database.load_dataset(-1)
+    with pytest.raises(ValueError):
+        database.append_dataset(-1, make_frame(0, 1))
+
+
+def test_dtypes_are_inferred_over_all_chunks():
+    # The first chunk alone looks integer; a later chunk has floats and missing values
+    df = pd.DataFrame({'amount': [1, 2, 3, 4, 5.5, None, 7]})
+    dataset_id = database.save_dataset([(None, df)], 'mixed')
+    loaded = database.load_dataset(dataset_id)
+    assert loaded['amount'].dtype == float
+    pd.testing.assert_frame_equal(loaded, df)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import build_time_index, build_preaggregates, resample_time_series, parse_datetime_columns
+
+
+@pytest.fixture
+def minute_series():
+    index = pd.date_range('2020-01-01', '2020-01-31', freq='min')
+    values = np.random.default_rng(0).normal(size=len(index))
+    values[::7] = np.nan
+    df = pd.DataFrame({'time': index, 'value': values})
+    ts = build_time_index(df, 'time', ['value'])
+    return ts, build_preaggregates(ts)
+
+
+@pytest.mark.parametrize('freq', ['h', '6h', 'D'])
+@pytest.mark.parametrize('how', ['mean', 'sum', 'count', 'min', 'max'])
+@pytest.mark.parametrize('start, end', [
+    ('2020-01-10 12:30', '2020-01-12 06:15'),
+    ('2020-01-05 03:17:30', '2020-01-05 03:50'),
+    (None, None)
+])
+def test_resample_matches_raw_rows(minute_series, freq, how, start, end):
+    ts, preaggs = minute_series
+    result = resample_time_series(ts, preaggs, freq, how, start, end)
+
+    resampled = ts.loc[start:end].resample(freq)
+    expected = resampled.agg(how)[resampled.count()['value'] > 0]
+    pd.testing.assert_frame_equal(result, expected, check_names=False, check_freq=False, check_dtype=False)
+
+
+@pytest.mark.parametrize('values', [
+    ['1:30', '2:45'],
+    ['01:30:00', '12:15:30'],
+    ['1.10.22', '1.2.30'],
+    ['2020-01-01'] * 150 + ['1:30']
+])
+def test_values_without_a_date_are_not_parsed(values):
+    df = pd.DataFrame({'value': values})
+    parse_datetime_columns(df)
+    assert df['value'].tolist() == values
+
+
+def test_full_dates_are_parsed():
+    df = pd.DataFrame({'value': ['2020-01-02', '2020-02-03 10:00']})
+    parse_datetime_columns(df)
+    assert pd.api.types.is_datetime64_any_dtype(df['value'])
@@ -1,20 +1,229 @@
 import pandas as pd
 import numpy as np
 from scipy import stats
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import gzip
+import hashlib
+import json
+import os
+import re
+import warnings
+import zipfile
+from sketches import build_sketches, merge_sketches, summarize_sketches
 
-def load_data(file):
-    """Load data from uploaded file"""
-    if file.name.endswith('.csv'):
-        return pd.read_csv(file)
-    elif file.name.endswith(('.xls', '.xlsx')):
-        return pd.read_excel(file)
+# File extension -> reader format
+FILE_FORMATS = {
+    '.csv': 'csv',
+    '.xls': 'excel',
+    '.xlsx': 'excel',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.ipc': 'feather',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl'
+}
+# Compression suffix -> pandas compression name (text formats only)
+COMPRESSIONS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+    '.bz2': 'bz2',
+    '.xz': 'xz'
+}
+# Default number of rows in the interactive sample
+DEFAULT_SAMPLE_SIZE = 50_000
+
+# Values inspected when deciding whether a text column holds dates
+DATETIME_DETECTION_SAMPLE = 100
+# Text values must start with a full date (year, month and day) to be parsed;
+# time-only and duration strings such as 1:30 are left alone
+DATETIME_PATTERN = re.compile(r'^\s*(\d{4}[-/]\d{1,2}[-/]\d{1,2}|\d{1,2}[-/]\d{1,2}[-/]\d{2,4})(?!\d)')
+# Field names pyarrow gives unnamed pandas index levels
+INDEX_FIELD_PATTERN = re.compile(r'^__index_level_\d+__$')
+
+# Formats offered for export
+EXPORT_FORMATS = ['csv', 'csv.gz', 'parquet', 'feather', 'jsonl']
+# Rows written per batch when exporting
+EXPORT_CHUNK_ROWS = 100_000
+# Rows read per batch from JSON-lines files
+JSONL_CHUNK_ROWS = 100_000
+
+def get_file_format(name):
+    """Return (format, compression) for a file name, or (None, None) if unsupported"""
+    name = name.lower()
+    compression = None
+    for suffix, codec in COMPRESSIONS.items():
+        if name.endswith(suffix):
+            name, compression = name[:-len(suffix)], codec
+            break
+    for suffix, fmt in FILE_FORMATS.items():
+        if name.endswith(suffix):
+            if compression and fmt not in ('csv', 'jsonl'):
+                return None, None
+            return fmt, compression
+    return None, None
+
+def read_table(source, name, columns=None):
+    """Read a file-like object in the format implied by name, loading only columns"""
+    fmt, compression = get_file_format(name)
+    columns = list(columns) if columns is not None else None
+    if fmt == 'csv':
+        df = pd.read_csv(source, usecols=columns, compression=compression)
+    elif fmt == 'excel':
+        df = pd.read_excel(source, usecols=columns)
+    elif fmt == 'parquet':
+        df = restore_index_columns(pd.read_parquet(source, columns=columns), columns)
+    elif fmt == 'feather':
+        df = restore_index_columns(pd.read_feather(source, columns=columns), columns)
+    elif fmt == 'jsonl':
+        reader = pd.read_json(source, lines=True, chunksize=JSONL_CHUNK_ROWS, compression=compression)
+        frames = [chunk if columns is None else chunk.reindex(columns=columns) for chunk in reader]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
     else:
         raise ValueError("Unsupported file format")
+    if fmt in ('jsonl', 'parquet', 'feather'):
+        stringify_nested_values(df)
+    return parse_datetime_columns(df)
+
+def _nested_to_json(value):
+    return json.dumps(value, default=lambda v: v.tolist() if isinstance(v, np.ndarray) else str(v))
+
+def stringify_nested_values(df):
+    """Replace list, dict and array cells (nested JSON, Arrow list/struct columns) with JSON strings (in place)"""
+    for col in df.select_dtypes(include=['object']).columns:
+        nested = df[col].map(lambda v: isinstance(v, (list, dict, np.ndarray))).to_numpy(dtype=bool)
+        if nested.any():
+            df.loc[nested, col] = df.loc[nested, col].map(_nested_to_json)
+    return df
+
+def restore_index_columns(df, columns=None):
+    """Turn named index levels restored from pandas metadata back into columns, dropping unnamed ones"""
+    if isinstance(df.index, pd.RangeIndex):
+        return df
+    names = [name for name in df.index.names if name is not None]
+    if names:
+        df = df.reset_index(level=names)
+    df = df.reset_index(drop=True)
+    return df if columns is None else df[columns]
+
+def parse_datetime_columns(df):
+    """Convert text columns whose values are all dates to datetime64 (in place)"""
+    for col in df.select_dtypes(include=['object']).columns:
+        values = df[col].dropna()
+        sample = values.head(DATETIME_DETECTION_SAMPLE)
+        if sample.empty or not all(isinstance(v, str) and DATETIME_PATTERN.match(v) for v in sample):
+            continue
+        # Every value must carry a date, not just the sampled ones
+        if not values.astype(str).str.match(DATETIME_PATTERN).all():
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            for fmt in (None, 'ISO8601'):
+                try:
+                    df[col] = pd.to_datetime(df[col], format=fmt)
+                    break
+                except (ValueError, TypeError, OverflowError):
+                    continue
+    return df
+
+def read_columns(file):
+    """Return the column names of an uploaded file without loading its rows"""
+    fmt, compression = get_file_format(file.name)
+    try:
+        if fmt == 'csv':
+            return pd.read_csv(file, nrows=0, compression=compression).columns.tolist()
+        elif fmt == 'excel':
+            return pd.read_excel(file, nrows=0).columns.tolist()
+        elif fmt == 'parquet':
+            import pyarrow.parquet as pq
+            names = pq.read_schema(file).names
+        elif fmt == 'feather':
+            import pyarrow.ipc as ipc
+            names = ipc.open_file(file).schema.names
+        elif fmt == 'jsonl':
+            return pd.read_json(file, lines=True, nrows=100, compression=compression).columns.tolist()
+        else:
+            raise ValueError("Unsupported file format")
+        # Unnamed index levels are dropped on read, so they are not offered
+        return [name for name in names if not INDEX_FIELD_PATTERN.match(name)]
+    finally:
+        file.seek(0)
+
+def load_data(file, columns=None):
+    """Load data from uploaded file, optionally projecting to a subset of columns"""
+    return read_table(file, file.name, columns=columns)
+
+def export_data(data, fmt, index=False):
+    """Serialize a DataFrame (or Series) to bytes, writing it in row batches"""
+    df = data.to_frame() if isinstance(data, pd.Series) else data
+    if index:
+        df = df.reset_index()
+    buffer = BytesIO()
+    starts = range(0, max(len(df), 1), EXPORT_CHUNK_ROWS)
+
+    if fmt in ('csv', 'csv.gz'):
+        stream = gzip.GzipFile(fileobj=buffer, mode='wb') if fmt == 'csv.gz' else buffer
+        for start in starts:
+            chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+            stream.write(chunk.to_csv(index=False, header=(start == 0)).encode('utf-8'))
+        if stream is not buffer:
+            stream.close()
+    elif fmt == 'jsonl':
+        for start in starts:
+            text = df.iloc[start:start + EXPORT_CHUNK_ROWS].to_json(orient='records', lines=True, date_format='iso')
+            if text and not text.endswith('\n'):
+                text += '\n'
+            buffer.write(text.encode('utf-8'))
+    elif fmt in ('parquet', 'feather'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.ipc as ipc
+        df = df.rename(columns=str)
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        writer = pq.ParquetWriter(buffer, schema) if fmt == 'parquet' else ipc.new_file(buffer, schema)
+        with writer:
+            for start in starts:
+                chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    return buffer.getvalue()
+
+# Categorical columns with more distinct values than this get no per-group profile
+MAX_PROFILE_GROUPS = 1_000
+
+# Range filters on frames at least this large are served from a sorted index
+SORTED_INDEX_MIN_ROWS = 100_000
+# Maximum number of predicate masks kept in a filter cache
+MAX_CACHED_MASKS = 32
+
+# Resolutions kept as pre-aggregates, finest first
+PREAGGREGATE_LEVELS = ['s', 'min', 'h', 'D']
+# Statistics kept per pre-aggregate bin and how they roll up into coarser bins
+PREAGGREGATE_ROLLUPS = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+# Calendar frequencies, binned by period; fixed frequencies are binned by flooring
+CALENDAR_FREQUENCIES = {'W': 7, 'M': 30.44, 'Q': 91.31, 'Y': 365.25}
+# Resample frequencies offered for time series, finest first
+RESAMPLE_FREQUENCIES = ['s', '10s', 'min', '5min', '15min', 'h', '6h', 'D', 'W', 'M', 'Q', 'Y']
+# Target maximum number of points when choosing a resolution automatically
+MAX_TIME_SERIES_POINTS = 5_000
+
+# Upper bound on resampled values per batch (larger batches fall out of CPU cache)
+RESAMPLE_BATCH_ELEMENTS = 1_000_000
+
+FILTER_OPERATORS = ['between', '==', '!=', 'isin', 'contains', 'is null', 'is not null']
 
 def get_numeric_columns(df):
     """Return list of numeric columns"""
     return df.select_dtypes(include=[np.number]).columns.tolist()
 
+def get_datetime_columns(df):
+    """Return list of datetime columns"""
+    return df.select_dtypes(include=['datetime', 'datetimetz']).columns.tolist()
+
 def get_categorical_columns(df):
     """Return list of categorical columns"""
     return df.select_dtypes(include=['object', 'category']).columns.tolist()
@@ -41,6 +250,23 @@ def calculate_summary_stats(df):
     except Exception as e:
         raise Exception(f"Error calculating summary statistics: {str(e)}")
 
+def build_dataset_sketches(df):
+    """Build mergeable column sketches for the numeric and categorical columns of df"""
+    return build_sketches(df, get_numeric_columns(df), get_categorical_columns(df))
+
+def update_dataset_sketches(sketches, delta_df):
+    """Merge sketches of newly appended rows into existing dataset sketches"""
+    return merge_sketches(sketches, build_dataset_sketches(delta_df))
+
+def calculate_approximate_summary_stats(df, sketches=None):
+    """Sketch-based summary statistics (approximate distinct counts, top values and quantiles)"""
+    try:
+        if sketches is None:
+            sketches = build_dataset_sketches(df)
+        return summarize_sketches(sketches)
+    except Exception as e:
+        raise Exception(f"Error calculating approximate summary statistics: {str(e)}")
+
 def perform_normality_test(data):
     """Perform Shapiro-Wilk normality test"""
     try:
@@ -97,13 +323,18 @@ def perform_anova(data_groups):
             'error': str(e)
         }
 
+def _cohens_d(data1, data2, axis=-1):
+    """Cohen's d with pooled sample variance, computed along axis"""
+    n1, n2 = data1.shape[axis], data2.shape[axis]
+    pooled_var = (
+        (n1 - 1) * np.var(data1, axis=axis, ddof=1) + (n2 - 1) * np.var(data2, axis=axis, ddof=1)
+    ) / (n1 + n2 - 2)
+    return (np.mean(data1, axis=axis) - np.mean(data2, axis=axis)) / np.sqrt(pooled_var)
+
 def calculate_effect_size(data1, data2):
     """Calculate Cohen's d effect size"""
     try:
-        d = (np.mean(data1) - np.mean(data2)) / np.sqrt(
-            ((len(data1) - 1) * np.var(data1) + (len(data2) - 1) * np.var(data2)) /
-            (len(data1) + len(data2) - 2)
-        )
+        d = _cohens_d(np.asarray(data1, dtype=float), np.asarray(data2, dtype=float))
         return {
             'metric': "Cohen's d",
             'value': d,
@@ -125,4 +356,584 @@ def interpret_cohens_d(d):
     elif d < 0.8:
         return 'Medium effect'
     else:
-        return 'Large effect'
\ No newline at end of file
+        return 'Large effect'
+
+def compute_profile(df, shift=None):
+    """Compute additive sufficient statistics for numeric columns and groups.
+
+    Sums are taken around a fixed per-column shift (the first chunk's means)
+    so that profiles of appended chunks can be merged by simple addition.
+    """
+    numeric_cols = get_numeric_columns(df)
+    categorical_cols = get_categorical_columns(df)
+    values = df[numeric_cols].to_numpy(dtype=float)
+    if shift is None:
+        shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(df) else np.zeros(len(numeric_cols))
+    mask = ~np.isnan(values)
+    centered = np.where(mask, values - shift, 0.0)
+    weights = mask.astype(float)
+
+    # Pairwise-complete co-moment sums, matching DataFrame.corr semantics
+    comoments = {
+        'n': weights.T @ weights,
+        'sx': centered.T @ weights,
+        'sxx': (centered ** 2).T @ weights,
+        'sxy': centered.T @ centered
+    }
+
+    # Per-group moments for low-cardinality categorical columns
+    group_cols = [col for col in categorical_cols if df[col].nunique() <= MAX_PROFILE_GROUPS]
+    centered_df = df[numeric_cols] - shift
+    squared_df = centered_df ** 2
+    groups = {}
+    for cat_col in group_cols:
+        grouped = df.groupby(cat_col)[numeric_cols]
+        groups[cat_col] = {
+            'count': grouped.count(),
+            'sum': centered_df.groupby(df[cat_col]).sum(),
+            'sumsq': squared_df.groupby(df[cat_col]).sum(),
+            'min': grouped.min(),
+            'max': grouped.max()
+        }
+
+    return {
+        'rows': len(df),
+        'numeric_cols': numeric_cols,
+        'shift': shift,
+        'comoments': comoments,
+        'min': df[numeric_cols].min(),
+        'max': df[numeric_cols].max(),
+        'groups': groups
+    }
+
+def merge_profiles(profile, delta):
+    """Merge the profile of an appended chunk into an existing profile"""
+    if profile['numeric_cols'] != delta['numeric_cols']:
+        raise ValueError("Cannot merge profiles with different numeric columns")
+
+    groups = {}
+    for cat_col, stats_ in profile['groups'].items():
+        delta_stats = delta['groups'].get(cat_col)
+        if delta_stats is None:
+            # The delta has too many groups; analysis falls back to an exact groupby
+            continue
+        merged = {
+            'count': stats_['count'].add(delta_stats['count'], fill_value=0),
+            'sum': stats_['sum'].add(delta_stats['sum'], fill_value=0),
+            'sumsq': stats_['sumsq'].add(delta_stats['sumsq'], fill_value=0),
+            'min': pd.concat([stats_['min'], delta_stats['min']]).groupby(level=0).min(),
+            'max': pd.concat([stats_['max'], delta_stats['max']]).groupby(level=0).max()
+        }
+        if len(merged['count']) <= MAX_PROFILE_GROUPS:
+            groups[cat_col] = merged
+
+    return {
+        'rows': profile['rows'] + delta['rows'],
+        'numeric_cols': profile['numeric_cols'],
+        'shift': profile['shift'],
+        'comoments': {
+            key: profile['comoments'][key] + delta['comoments'][key]
+            for key in profile['comoments']
+        },
+        'min': pd.concat([profile['min'], delta['min']], axis=1).min(axis=1),
+        'max': pd.concat([profile['max'], delta['max']], axis=1).max(axis=1),
+        'groups': groups
+    }
+
+def update_profile(profile, delta_df):
+    """Incrementally update a profile with newly appended rows"""
+    return merge_profiles(profile, compute_profile(delta_df, shift=profile['shift']))
+
+def profile_correlation(profile):
+    """Pearson correlation matrix from a profile's co-moment sums"""
+    c = profile['comoments']
+    n, sx, sxx, sxy = c['n'], c['sx'], c['sxx'], c['sxy']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sx.T
+        var_x = n * sxx - sx ** 2
+        corr = cov / np.sqrt(var_x * var_x.T)
+    cols = profile['numeric_cols']
+    return pd.DataFrame(np.clip(corr, -1, 1), index=cols, columns=cols)
+
+def profile_basic_stats(profile):
+    """Mean, standard deviation, min and max per numeric column from a profile"""
+    c = profile['comoments']
+    n = np.diag(c['n'])
+    sx = np.diag(c['sx'])
+    sxx = np.diag(c['sxx'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sx / n
+        std = np.sqrt(np.maximum(sxx - n * mean ** 2, 0) / (n - 1))
+    cols = profile['numeric_cols']
+    return pd.DataFrame({
+        'mean': pd.Series(mean + profile['shift'], index=cols),
+        'std': pd.Series(std, index=cols),
+        'min': profile['min'],
+        'max': profile['max']
+    }).T
+
+def profile_group_stats(profile, group_col, value_col, agg_func):
+    """Per-group aggregate (mean, sum, count, min, max) from a profile"""
+    groups = profile['groups'][group_col]
+    shift = pd.Series(profile['shift'], index=profile['numeric_cols'])[value_col]
+    count = groups['count'][value_col]
+    if agg_func == 'count':
+        return count
+    if agg_func == 'sum':
+        return groups['sum'][value_col] + shift * count
+    if agg_func == 'mean':
+        return groups['sum'][value_col] / count + shift
+    if agg_func in ('min', 'max'):
+        return groups[agg_func][value_col]
+    raise ValueError(f"Unsupported aggregation function: {agg_func}")
+
+
+def build_sorted_index(series):
+    """Return the sorted non-null values of a column and their row positions"""
+    if pd.api.types.is_extension_array_dtype(series.dtype):
+        # Nullable dtypes hold pd.NA, which NumPy cannot sort
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        values = series.to_numpy()
+    valid = np.flatnonzero(~pd.isna(values))
+    order = valid[np.argsort(values[valid], kind='stable')]
+    return values[order], order
+
+def range_mask_from_index(index, n_rows, low, high):
+    """Build a boolean mask for low <= value <= high using a sorted index"""
+    sorted_values, order = index
+    start = np.searchsorted(sorted_values, low, side='left')
+    end = np.searchsorted(sorted_values, high, side='right')
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[order[start:end]] = True
+    return mask
+
+def build_filter_mask(df, predicate, cache=None):
+    """Evaluate a single (column, operator, value) predicate as a boolean array"""
+    column, op, value = predicate
+    series = df[column]
+
+    if op == 'between':
+        low, high = value
+        if cache is not None and len(df) >= SORTED_INDEX_MIN_ROWS:
+            indexes = cache.setdefault('indexes', {})
+            if column not in indexes:
+                indexes[column] = build_sorted_index(series)
+            return range_mask_from_index(indexes[column], len(df), low, high)
+        return series.between(low, high).to_numpy(dtype=bool, na_value=False)
+    elif op == '==':
+        return (series == value).to_numpy(dtype=bool, na_value=False)
+    elif op == '!=':
+        return (series != value).to_numpy(dtype=bool, na_value=False)
+    elif op == 'isin':
+        return series.isin(list(value)).to_numpy(dtype=bool, na_value=False)
+    elif op == 'contains':
+        return series.astype('string').str.contains(value, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+    elif op == 'is null':
+        return series.isna().to_numpy(dtype=bool)
+    elif op == 'is not null':
+        return series.notna().to_numpy(dtype=bool)
+    else:
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+def apply_filters(df, predicates, cache=None):
+    """Combine predicates into one boolean mask, reusing cached predicate masks"""
+    mask = np.ones(len(df), dtype=bool)
+    for predicate in predicates:
+        if cache is None:
+            mask &= build_filter_mask(df, predicate)
+            continue
+
+        masks = cache.setdefault('masks', {})
+        if predicate in masks:
+            # Move to the end so eviction drops the least recently used mask
+            masks[predicate] = masks.pop(predicate)
+        else:
+            masks[predicate] = build_filter_mask(df, predicate, cache)
+            while len(masks) > MAX_CACHED_MASKS:
+                masks.pop(next(iter(masks)))
+        mask &= masks[predicate]
+    return mask
+
+
+def _parse_part(name, payload):
+    """Parse one file's bytes into a list of (label, DataFrame) partitions"""
+    fmt, _ = get_file_format(name)
+    if fmt == 'excel':
+        # Read every sheet of the workbook
+        sheets = pd.read_excel(BytesIO(payload), sheet_name=None)
+        return [(f"{name}:{sheet}", df) for sheet, df in sheets.items()]
+    elif fmt is not None:
+        return [(name, read_table(BytesIO(payload), name))]
+    else:
+        raise ValueError(f"Unsupported file format: {name}")
+
+def expand_uploads(files):
+    """Expand uploaded files and zip archives into (name, bytes) parse tasks"""
+    tasks = []
+    for file in files:
+        payload = file.getvalue() if hasattr(file, 'getvalue') else file.read()
+        if file.name.endswith('.zip'):
+            with zipfile.ZipFile(BytesIO(payload)) as archive:
+                for member in archive.namelist():
+                    if get_file_format(member)[0] and not member.startswith('__MACOSX/'):
+                        tasks.append((f"{file.name}/{member}", archive.read(member)))
+        elif get_file_format(file.name)[0]:
+            tasks.append((file.name, payload))
+        else:
+            raise ValueError(f"Unsupported file format: {file.name}")
+    return tasks
+
+def reconcile_schemas(frames):
+    """Align partitions to a shared set of columns with a common dtype per column"""
+    columns = list(dict.fromkeys(col for df in frames for col in df.columns))
+    dtypes = {}
+    for col in columns:
+        col_dtypes = [df[col].dtype for df in frames if col in df.columns]
+        if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+               for dtype in col_dtypes):
+            # Nullable extension dtypes (Int64, Float64) are compared through their NumPy dtype
+            common = np.result_type(*[getattr(dtype, 'numpy_dtype', dtype) for dtype in col_dtypes])
+            if common.kind in 'iu' and any(pd.api.types.is_extension_array_dtype(d) for d in col_dtypes):
+                # Keep nullable integers nullable; missing partitions are filled with NA
+                common = pd.api.types.pandas_dtype(f"{'U' if common.kind == 'u' else ''}Int{common.itemsize * 8}")
+            elif len(col_dtypes) < len(frames):
+                # Partitions missing the column are filled with NaN
+                common = np.result_type(common, np.float64)
+            dtypes[col] = common
+        elif len(col_dtypes) == len(frames) and len(set(col_dtypes)) == 1:
+            dtypes[col] = col_dtypes[0]
+        elif all(pd.api.types.is_bool_dtype(dtype) for dtype in col_dtypes):
+            # Nullable booleans, so the missing partitions stay NA instead of becoming True
+            dtypes[col] = 'boolean'
+        elif len(set(col_dtypes)) == 1 and pd.api.types.is_datetime64_any_dtype(col_dtypes[0]):
+            dtypes[col] = col_dtypes[0]
+        else:
+            dtypes[col] = object
+    return [df.reindex(columns=columns).astype(dtypes) for df in frames]
+
+def load_bulk_data(files, max_workers=None):
+    """Parse multiple files, zip archives and workbook sheets in parallel.
+
+    Returns a list of (label, DataFrame) partitions with reconciled schemas.
+    """
+    tasks = expand_uploads(files)
+    if not tasks:
+        raise ValueError("No supported data files found in the upload")
+
+    if len(tasks) == 1:
+        results = [_parse_part(*tasks[0])]
+    else:
+        max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_parse_part, *zip(*tasks)))
+
+    parts = [part for result in results for part in result]
+    labels = [label for label, _ in parts]
+    frames = reconcile_schemas([df for _, df in parts])
+    return list(zip(labels, frames))
+
+
+def build_sample(df, size, seed=0, stratify_col=None):
+    """Seeded uniform or stratified random sample of about size rows.
+
+    Each row gets a random key and the rows with the smallest keys are kept
+    (a bottom-k sample, equivalent to reservoir sampling). With stratify_col,
+    every category keeps a proportional share of at least one row, as long as
+    there are no more categories than size; the total never exceeds size.
+    Rows are returned in their original order.
+    """
+    if len(df) <= size:
+        return df
+
+    rng = np.random.default_rng(seed)
+    keys = rng.random(len(df))
+
+    if stratify_col is None:
+        positions = np.argpartition(keys, size)[:size]
+    else:
+        codes, _ = pd.factorize(df[stratify_col], use_na_sentinel=False)
+        counts = np.bincount(codes)
+        quotas = np.minimum(np.maximum(np.round(counts * size / len(df)).astype(int), 1), counts)
+
+        # Rank each row's key within its stratum and keep ranks below the quota
+        order = np.lexsort((keys, codes))
+        sorted_codes = codes[order]
+        starts = np.searchsorted(sorted_codes, np.arange(len(counts)))
+        ranks = np.arange(len(df)) - starts[sorted_codes]
+        selected = ranks < quotas[sorted_codes]
+        positions = order[selected]
+        if len(positions) > size:
+            # The one-row minimums overshot size: keep lower in-stratum ranks first
+            keep = np.lexsort((keys[positions], ranks[selected]))[:size]
+            positions = positions[keep]
+
+    return df.iloc[np.sort(positions)]
+
+
+# Statistics evaluated row-wise on batches of resamples (one resample per row)
+BOOTSTRAP_STATISTICS = {
+    'mean': lambda x: x.mean(axis=1),
+    'mean_difference': lambda x, y: x.mean(axis=1) - y.mean(axis=1),
+    'cohens_d': lambda x, y: _cohens_d(x, y, axis=1)
+}
+
+BOOTSTRAP_STATISTIC_NAMES = {
+    'mean': 'Mean',
+    'mean_difference': 'Difference in means',
+    'cohens_d': "Cohen's d"
+}
+
+def _index_dtype(n):
+    """Smallest integer dtype able to index n rows"""
+    return np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+def _bootstrap_batch(samples, statistic, size, seed):
+    """Evaluate a statistic on `size` bootstrap resamples drawn with one index matrix per sample"""
+    rng = np.random.default_rng(seed)
+    resampled = [
+        x[rng.integers(0, len(x), size=(size, len(x)), dtype=_index_dtype(len(x)))]
+        for x in samples
+    ]
+    return BOOTSTRAP_STATISTICS[statistic](*resampled)
+
+def _permutation_batch(samples, statistic, size, seed):
+    """Difference in means under `size` random relabelings (or sign flips for one sample)"""
+    rng = np.random.default_rng(seed)
+    if len(samples) == 1:
+        x = samples[0]
+        signs = rng.integers(0, 2, size=(size, len(x)), dtype=np.int8) * 2 - 1
+        return (signs * x).mean(axis=1)
+
+    x, y = samples
+    pooled = np.concatenate([x, y])
+    # Shuffling the values per row is a uniformly random relabeling, and much cheaper
+    # than drawing a float key per value and partitioning the keys
+    shuffled = rng.permuted(np.broadcast_to(pooled, (size, len(pooled))), axis=1)
+    sum1 = shuffled[:, :len(x)].sum(axis=1)
+    return sum1 / len(x) - (pooled.sum() - sum1) / len(y)
+
+# Samples sent once to each resampling worker process by its initializer
+_worker_samples = None
+
+def _init_resampling_worker(samples):
+    global _worker_samples
+    _worker_samples = samples
+
+def _resample_range(worker, statistic, sizes, seeds):
+    """Run a contiguous range of batches on the samples held by this worker process"""
+    return np.concatenate([worker(_worker_samples, statistic, size, s) for size, s in zip(sizes, seeds)])
+
+def _run_resampling(worker, samples, statistic, n_resamples, seed, n_jobs):
+    """Run resampling in memory-bounded batches, optionally across a process pool.
+
+    Each batch draws from its own child of a SeedSequence, so results depend
+    only on the seed and not on n_jobs. Worker processes receive the samples
+    once and run a contiguous range of batches each.
+    """
+    row_elements = sum(len(x) for x in samples)
+    batch_size = max(1, RESAMPLE_BATCH_ELEMENTS // max(row_elements, 1))
+    sizes = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if n_jobs > 1 and len(sizes) > 1:
+        n_workers = min(n_jobs, len(sizes))
+        bounds = np.linspace(0, len(sizes), n_workers + 1).astype(int)
+        ranges = list(zip(bounds[:-1], bounds[1:]))
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_resampling_worker,
+            initargs=(samples,)
+        ) as executor:
+            results = list(executor.map(
+                _resample_range,
+                [worker] * n_workers,
+                [statistic] * n_workers,
+                [sizes[lo:hi] for lo, hi in ranges],
+                [seeds[lo:hi] for lo, hi in ranges]
+            ))
+    else:
+        results = [worker(samples, statistic, size, s) for size, s in zip(sizes, seeds)]
+    return np.concatenate(results)
+
+def bootstrap_ci(data1, data2=None, statistic='mean', n_resamples=10_000,
+                 confidence=0.95, seed=0, n_jobs=1):
+    """Percentile bootstrap confidence interval for a mean, difference in means or Cohen's d"""
+    try:
+        samples = [np.asarray(data1, dtype=float)]
+        if data2 is not None:
+            samples.append(np.asarray(data2, dtype=float))
+        if statistic not in BOOTSTRAP_STATISTICS:
+            raise ValueError(f"Unsupported bootstrap statistic: {statistic}")
+
+        estimate = BOOTSTRAP_STATISTICS[statistic](*[x[np.newaxis, :] for x in samples])[0]
+        distribution = _run_resampling(_bootstrap_batch, samples, statistic, n_resamples, seed, n_jobs)
+        alpha = (1 - confidence) / 2
+        lower, upper = np.nanquantile(distribution, [alpha, 1 - alpha])
+        return {
+            'metric': BOOTSTRAP_STATISTIC_NAMES[statistic],
+            'value': estimate,
+            'ci_lower': lower,
+            'ci_upper': upper,
+            'confidence': confidence,
+            'n_resamples': n_resamples
+        }
+    except Exception as e:
+        return {
+            'metric': BOOTSTRAP_STATISTIC_NAMES.get(statistic, statistic),
+            'error': str(e)
+        }
+
+def permutation_test(data1, data2=None, paired=False, n_resamples=10_000, seed=0, n_jobs=1):
+    """Two-sided permutation test for a difference in means (sign-flip test for one-sample/paired data)"""
+    try:
+        x = np.asarray(data1, dtype=float)
+        if data2 is None:
+            samples = [x]
+            test_type = 'One-sample'
+        elif paired:
+            y = np.asarray(data2, dtype=float)
+            if len(x) != len(y):
+                raise ValueError("Paired samples must have the same length")
+            samples = [x - y]
+            test_type = 'Paired'
+        else:
+            samples = [x, np.asarray(data2, dtype=float)]
+            test_type = 'Independent'
+
+        observed = samples[0].mean() if len(samples) == 1 else samples[0].mean() - samples[1].mean()
+        distribution = _run_resampling(_permutation_batch, samples, None, n_resamples, seed, n_jobs)
+        # Relative tolerance keeps permutations that tie the observed value up to rounding
+        p_value = (np.count_nonzero(np.abs(distribution) >= abs(observed) * (1 - 1e-9)) + 1) / (n_resamples + 1)
+        return {
+            'test_type': f'{test_type} permutation test',
+            'statistic': observed,
+            'p_value': p_value,
+            'significant': p_value < 0.05
+        }
+    except Exception as e:
+        return {
+            'test_type': 'Permutation test',
+            'error': str(e)
+        }
+
+
+def dataset_fingerprint(df):
+    """Content hash of a DataFrame covering values, index, column names and dtypes"""
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_time_index(df, time_col, value_cols):
+    """Value columns indexed by a sorted DatetimeIndex, dropping rows without a timestamp"""
+    ts = df.loc[df[time_col].notna(), [time_col] + list(value_cols)].set_index(time_col)
+    if not ts.index.is_monotonic_increasing:
+        ts = ts.sort_index(kind='stable')
+    return ts
+
+def _rollup(agg, keys):
+    """Combine pre-aggregated bins into coarser bins identified by keys"""
+    return agg.groupby(keys).agg({col: PREAGGREGATE_ROLLUPS[col[1]] for col in agg.columns})
+
+def build_preaggregates(ts):
+    """Count/sum/min/max per bin at each pre-aggregate level, each built from the previous.
+
+    Only non-empty bins are stored, and levels that do not at least halve the
+    number of rows are skipped since the raw data serves them as well.
+    """
+    preaggs = {}
+    source = None
+    for level in PREAGGREGATE_LEVELS:
+        if source is None:
+            agg = ts.groupby(ts.index.floor(level)).agg(list(PREAGGREGATE_ROLLUPS))
+        else:
+            agg = _rollup(source, source.index.floor(level))
+        if len(agg) * 2 <= len(ts):
+            preaggs[level] = agg
+        source = agg
+    return preaggs
+
+def _bin_keys(index, freq):
+    """Bin start timestamps for a DatetimeIndex at a fixed or calendar frequency"""
+    if freq in CALENDAR_FREQUENCIES:
+        return index.to_period(freq).start_time
+    return index.floor(freq)
+
+def _frequency_nanos(freq):
+    """Approximate bin width in nanoseconds"""
+    if freq in CALENDAR_FREQUENCIES:
+        return int(CALENDAR_FREQUENCIES[freq] * 86_400 * 10**9)
+    return pd.tseries.frequencies.to_offset(freq).nanos
+
+def median_spacing(ts):
+    """Median gap in nanoseconds between distinct timestamps of a sorted time index"""
+    stamps = ts.index.asi8
+    gaps = np.diff(stamps)
+    gaps = gaps[gaps > 0]
+    return int(np.median(gaps)) if gaps.size else 0
+
+def choose_resample_frequency(start, end, spacing=0, max_points=MAX_TIME_SERIES_POINTS):
+    """Finest resample frequency no finer than the data spacing with at most max_points bins"""
+    span = (pd.Timestamp(end) - pd.Timestamp(start)).value
+    for freq in RESAMPLE_FREQUENCIES:
+        nanos = _frequency_nanos(freq)
+        if nanos >= spacing and span / nanos <= max_points:
+            return freq
+    return RESAMPLE_FREQUENCIES[-1]
+
+def _clip_preaggregate(ts, agg, level, start, end, columns):
+    """Pre-aggregate bins of the given columns covering exactly [start, end].
+
+    Bins lying wholly inside the range come from agg; the partial bins at
+    either edge are recomputed from the raw rows.
+    """
+    start = ts.index[0] if start is None else pd.Timestamp(start)
+    end = ts.index[-1] if end is None else pd.Timestamp(end)
+    one = pd.Timedelta(1, 'ns')
+    first, stop = start.ceil(level), (end + one).floor(level)
+    if first >= stop:
+        edges = ts.loc[start:end, columns]
+        interior = None
+    else:
+        edges = pd.concat([ts.loc[start:first - one, columns], ts.loc[stop:end, columns]])
+        interior = agg.loc[first:stop - one, columns]
+    edge_agg = edges.groupby(edges.index.floor(level)).agg(list(PREAGGREGATE_ROLLUPS))
+    return edge_agg if interior is None else pd.concat([edge_agg, interior])
+
+def resample_time_series(ts, preaggs, freq, how, start=None, end=None, columns=None):
+    """Aggregate ts (or the given columns of it) into freq bins between start and end.
+
+    Uses the coarsest pre-aggregate level whose bins nest inside freq bins,
+    falling back to the raw rows when none does.
+    """
+    freq_nanos = _frequency_nanos(freq)
+    source_level = None
+    for level in reversed(PREAGGREGATE_LEVELS):
+        level_nanos = _frequency_nanos(level)
+        nests = level_nanos <= _frequency_nanos('D') if freq in CALENDAR_FREQUENCIES else freq_nanos % level_nanos == 0
+        if level in preaggs and nests:
+            source_level = level
+            break
+
+    columns = list(ts.columns) if columns is None else list(columns)
+    if source_level is None:
+        raw = ts.loc[start:end, columns]
+        return raw.groupby(_bin_keys(raw.index, freq)).agg(how)
+
+    agg = _clip_preaggregate(ts, preaggs[source_level], source_level, start, end, columns)
+    binned = _rollup(agg, _bin_keys(agg.index, freq))
+    if how == 'mean':
+        return binned.xs('sum', axis=1, level=1) / binned.xs('count', axis=1, level=1)
+    if how in PREAGGREGATE_ROLLUPS:
+        return binned.xs(how, axis=1, level=1)
+    raise ValueError(f"Unsupported aggregation function: {how}")
+
+def apply_window(df, window_type, window, func):
+    """Rolling (over `window` periods) or expanding window statistic"""
+    if window_type == 'rolling':
+        return df.rolling(window, min_periods=1).agg(func)
+    elif window_type == 'expanding':
+        return df.expanding().agg(func)
+    return df